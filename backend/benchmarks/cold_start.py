@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget for the serverless entry point (api/index.py).
+
+Imports the entry point in fresh interpreters under `python -X importtime`,
+reports the median import time and the heaviest modules it pulls in, and
+exits non-zero when the median exceeds the budget or when a module that
+should be deferred until first use (sklearn, numpy, transformers, provider
+SDKs, database drivers) is imported eagerly. CI runs this on every push.
+
+Usage (from the repository root or the backend directory):
+    python backend/benchmarks/cold_start.py                     # budget from COLD_START_BUDGET_MS (default 1000)
+    python backend/benchmarks/cold_start.py --budget-ms 600 --runs 7
+    python backend/benchmarks/cold_start.py --top 25            # longer list of the heaviest imports
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ENTRY_DIR = BACKEND_DIR.parent / "api"
+ENTRY_MODULE = "index"
+
+# Repository packages are reported per module, third-party ones per top-level package
+LOCAL_PACKAGES = {path.name for path in BACKEND_DIR.iterdir() if path.is_dir()} | {path.stem for path in BACKEND_DIR.glob("*.py")}
+
+# Imported on first use only; any of these in sys.modules after the entry import fails the check
+DEFERRED_MODULES = [
+    "sklearn", "numpy", "scipy", "torch", "transformers", "optimum", "onnxruntime",
+    "openai", "anthropic", "google.generativeai", "psycopg", "psycopg2", "psycopg_pool", "redis"
+]
+
+PROBE = (
+    "import json, sys\n"
+    f"import {ENTRY_MODULE}\n"
+    f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))\n"
+)
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Read `-X importtime` output.
+
+    Returns:
+        (cumulative ms for the entry module, cumulative ms per package / repository module it imported)
+    """
+    packages: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        ms = int(cumulative) / 1000
+        module = name.strip()
+        # Modules are listed after their own imports: the entry's subtree is everything since the previous top-level line
+        if not name.startswith("  "):
+            if module == ENTRY_MODULE:
+                return ms, packages
+            packages = {}
+            continue
+        top = module.split(".")[0]
+        if top in LOCAL_PACKAGES:
+            if "." in module:
+                packages[module] = ms
+        elif "." not in module:
+            packages[top] = max(packages.get(top, 0.0), ms)
+    return 0.0, packages
+
+
+def run_once(env: Dict[str, str]) -> Tuple[float, Dict[str, float], List[str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True, text=True, cwd=ENTRY_DIR, env=env,
+    )
+    if proc.returncode != 0:
+        print(f"❌ Importing {ENTRY_MODULE} failed:\n{proc.stderr.strip()[-2000:]}", file=sys.stderr)
+        sys.exit(2)
+    total, packages = parse_importtime(proc.stderr)
+    eager = json.loads(proc.stdout.strip().splitlines()[-1])
+    return total, packages, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the serverless entry point's cold-start import time")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("COLD_START_BUDGET_MS", "1000")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # main refuses to import without a NewsAPI key; nothing is fetched at import time
+    env.setdefault("NEWSAPI_KEY", "cold-start-check")
+
+    # First run compiles bytecode (as a deploy build would), so it is not counted
+    run_once(env)
+    totals, heaviest, eager = [], {}, set()
+    for _ in range(max(1, args.runs)):
+        total, packages, loaded = run_once(env)
+        totals.append(total)
+        eager.update(loaded)
+        for name, ms in packages.items():
+            heaviest.setdefault(name, []).append(ms)
+
+    median = statistics.median(totals)
+    print(f"⏱️  import {ENTRY_MODULE}: median {median:.0f} ms, min {min(totals):.0f} ms, "
+          f"max {max(totals):.0f} ms over {len(totals)} runs (budget {args.budget_ms:.0f} ms)")
+    ranked = sorted(((statistics.median(ms), name) for name, ms in heaviest.items()), reverse=True)
+    print(f"{'package':<28} {'ms':>8}")
+    print("-" * 37)
+    for ms, name in ranked[:args.top]:
+        print(f"{name:<28} {ms:>8.1f}")
+
+    failed = False
+    if eager:
+        print(f"❌ Imported eagerly (should be deferred until first use): {', '.join(sorted(eager))}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"❌ Cold-start import time {median:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Cold-start import within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local inference backends (pytorch, quantized, onnx).
+
+Each backend runs in its own subprocess so resident memory is measured in
+isolation. Reports single-request latency, batched throughput, RSS after
+load and output agreement with the pytorch baseline.
+
+Usage (from the backend directory):
+    python benchmarks/inference_backends.py                 # production models
+    python benchmarks/inference_backends.py --tiny          # tiny random models, no download
+    python benchmarks/inference_backends.py --backends pytorch,quantized --batch-size 16
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+SAMPLE_TEXTS = [
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation in services. "
+    "Officials signalled that further increases were possible if price pressures did not ease over the summer. "
+    "Markets had largely expected the move, and stocks closed slightly higher after the announcement.",
+    "A powerful storm swept across the coast overnight, leaving thousands of homes without electricity. "
+    "Emergency crews worked through the morning to clear fallen trees from major roads. "
+    "Officials warned residents to stay indoors as flooding continued in low-lying neighbourhoods.",
+    "Researchers announced a new battery chemistry that could double the range of electric vehicles. "
+    "The team said early prototypes survived thousands of charge cycles with little degradation. "
+    "Industry analysts cautioned that mass production could still be several years away.",
+    "The city council approved a plan to expand public transit with three new bus rapid transit lines. "
+    "Supporters said the project would cut commute times and reduce congestion downtown. "
+    "Critics questioned the cost and asked for more detail on how the lines would be funded.",
+]
+
+DEFAULT_MODELS = {
+    "summarization": "facebook/bart-large-cnn",
+    "sentiment-analysis": "cardiffnlp/twitter-roberta-base-sentiment-latest",
+}
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (Linux /proc, falling back to peak RSS)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_tiny_models(root: Path) -> dict:
+    """
+    Create randomly initialized BART and RoBERTa models of the production
+    architectures (but tiny dimensions) with a byte-level tokenizer, so the
+    benchmark runs offline in seconds.
+    """
+    from transformers import (
+        BartConfig, BartForConditionalGeneration, BartTokenizerFast,
+        RobertaConfig, RobertaForSequenceClassification, RobertaTokenizerFast,
+    )
+    from transformers.models.gpt2.tokenization_gpt2 import bytes_to_unicode
+    import torch
+
+    torch.manual_seed(0)
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3}
+    for ch in bytes_to_unicode().values():
+        vocab[ch] = len(vocab)
+    vocab["<mask>"] = len(vocab)
+    (root / "vocab.json").write_text(json.dumps(vocab))
+    (root / "merges.txt").write_text("#version: 0.2\n")
+
+    bart_dir, roberta_dir = root / "bart", root / "roberta"
+    BartTokenizerFast(vocab_file=str(root / "vocab.json"), merges_file=str(root / "merges.txt"),
+                      model_max_length=1024).save_pretrained(bart_dir)
+    RobertaTokenizerFast(vocab_file=str(root / "vocab.json"), merges_file=str(root / "merges.txt"),
+                         model_max_length=512).save_pretrained(roberta_dir)
+
+    BartForConditionalGeneration(BartConfig(
+        vocab_size=len(vocab), d_model=64, encoder_layers=2, decoder_layers=2,
+        encoder_attention_heads=4, decoder_attention_heads=4, encoder_ffn_dim=128, decoder_ffn_dim=128,
+        max_position_embeddings=1024, forced_bos_token_id=0,
+    )).save_pretrained(bart_dir)
+    RobertaForSequenceClassification(RobertaConfig(
+        vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2, num_attention_heads=4,
+        intermediate_size=128, max_position_embeddings=520, pad_token_id=1, num_labels=3,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2},
+    )).save_pretrained(roberta_dir)
+
+    return {"summarization": str(bart_dir), "sentiment-analysis": str(roberta_dir)}
+
+
+def run_worker(backend: str, models: dict, batch_size: int, iterations: int, max_length: int) -> dict:
+    """Load both pipelines on one backend and measure them (runs inside the subprocess)."""
+    from ml_models.backends import build_pipeline
+
+    baseline_rss = current_rss_mb()
+    report = {"backend": backend, "tasks": {}}
+    for task, model_name in models.items():
+        started = time.perf_counter()
+        pipe = build_pipeline(task, model_name, backend)
+        load_seconds = time.perf_counter() - started
+
+        if task == "summarization":
+            kwargs = {"max_length": max_length, "min_length": min(10, max_length - 1), "do_sample": False, "truncation": True}
+        else:
+            kwargs = {"truncation": True}
+
+        pipe(SAMPLE_TEXTS[:2], batch_size=2, **kwargs)  # warm-up
+
+        latencies = []
+        for i in range(iterations):
+            started = time.perf_counter()
+            pipe(SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)], **kwargs)
+            latencies.append(time.perf_counter() - started)
+
+        batch = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(batch_size)]
+        started = time.perf_counter()
+        outputs = pipe(batch, batch_size=batch_size, **kwargs)
+        batch_seconds = time.perf_counter() - started
+
+        if task == "summarization":
+            predictions = [out["summary_text"] for out in outputs[:len(SAMPLE_TEXTS)]]
+        else:
+            predictions = [out["label"] for out in outputs[:len(SAMPLE_TEXTS)]]
+
+        latencies.sort()
+        report["tasks"][task] = {
+            "load_seconds": round(load_seconds, 3),
+            "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "latency_p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+            "throughput_per_s": round(batch_size / batch_seconds, 2),
+            "predictions": predictions,
+        }
+    report["rss_mb"] = round(current_rss_mb(), 1)
+    report["rss_delta_mb"] = round(report["rss_mb"] - baseline_rss, 1)
+    return report
+
+
+def token_f1(a: str, b: str) -> float:
+    """Unigram overlap F1 between two summaries (a cheap ROUGE-1 stand-in)."""
+    ta, tb = a.lower().split(), b.lower().split()
+    if not ta or not tb:
+        return float(ta == tb)
+    common = sum(min(ta.count(t), tb.count(t)) for t in set(ta))
+    if common == 0:
+        return 0.0
+    precision, recall = common / len(ta), common / len(tb)
+    return 2 * precision * recall / (precision + recall)
+
+
+def agreement(task: str, baseline: list, candidate: list) -> float:
+    if task == "summarization":
+        scores = [token_f1(a, b) for a, b in zip(baseline, candidate)]
+    else:
+        scores = [float(a == b) for a, b in zip(baseline, candidate)]
+    return round(sum(scores) / len(scores), 3) if scores else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local inference backends")
+    parser.add_argument("--backends", default="pytorch,quantized,onnx")
+    parser.add_argument("--tiny", action="store_true", help="use tiny randomly initialized models")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--max-length", type=int, default=60)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--models", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        report = run_worker(args.worker, json.loads(args.models), args.batch_size, args.iterations, args.max_length)
+        print(json.dumps(report))
+        return
+
+    tmp = None
+    if args.tiny:
+        tmp = tempfile.TemporaryDirectory()
+        models = build_tiny_models(Path(tmp.name))
+        os.environ["ONNX_MODEL_DIR"] = str(Path(tmp.name) / "onnx")
+    else:
+        models = DEFAULT_MODELS
+
+    reports = []
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        print(f"⏱️  Benchmarking {backend} backend...", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", backend, "--models", json.dumps(models),
+             "--batch-size", str(args.batch_size), "--iterations", str(args.iterations),
+             "--max-length", str(args.max_length)],
+            capture_output=True, text=True, cwd=BACKEND_DIR,
+        )
+        if proc.returncode != 0:
+            print(f"❌ {backend} failed:\n{proc.stderr.strip()[-2000:]}", file=sys.stderr)
+            continue
+        reports.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    baseline = next((r for r in reports if r["backend"] == "pytorch"), None)
+    header = f"{'backend':<10} {'task':<19} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} {'items/s':>8} {'RSS MB':>7} {'agree':>6}"
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        for task, metrics in report["tasks"].items():
+            agree = "-"
+            if baseline:
+                agree = f"{agreement(task, baseline['tasks'][task]['predictions'], metrics['predictions']):.3f}"
+            print(f"{report['backend']:<10} {task:<19} {metrics['load_seconds']:>7.2f} {metrics['latency_p50_ms']:>8.1f} "
+                  f"{metrics['latency_p95_ms']:>8.1f} {metrics['throughput_per_s']:>8.1f} {report['rss_mb']:>7.0f} {agree:>6}")
+
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
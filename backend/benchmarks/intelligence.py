@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Benchmark AIService routing, caching, batching and fallback against the provider simulator.
+
+Starts benchmarks/provider_simulator.py in-process (or uses --simulator-url),
+points every provider at it through the base-URL overrides and runs each
+scenario on a fresh AIService, so no real provider is called and results are
+reproducible for a given --seed.
+
+Scenarios:
+    routing      heavy-tailed providers, hedging on vs off
+    rate_limits  injected 429s on the preferred provider, scheduler on vs off
+    caching      duplicate bursts and repeat visits with the result store attached
+    batching     packed multi-article requests vs one request per article
+    streaming    time to first section vs full analysis
+    fallback     every provider failing, served by the local models
+
+Usage (from the backend directory):
+    python benchmarks/intelligence.py --tiny
+    python benchmarks/intelligence.py --scenarios routing,caching --requests 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from provider_simulator import ProviderSimulator, base_urls, create_app
+
+SCENARIOS = ("routing", "rate_limits", "caching", "batching", "streaming", "fallback")
+PROVIDER_KEYS = {
+    "openai": "OPENAI_API_KEY",
+    "claude": "CLAUDE_API_KEY",
+    "groq": "GROQ_API_KEY",
+    "gemini": "GEMINI_API_KEY"
+}
+
+TOPICS = [
+    "Central bank raises interest rates to curb inflation",
+    "Storm leaves thousands without power along the coast",
+    "Researchers unveil battery that doubles electric car range",
+    "City council approves new rapid transit lines",
+    "Tech giant reports record quarterly profits",
+    "Drought threatens harvest across farming region",
+    "Parliament passes landmark data privacy bill",
+    "Vaccine trial shows strong results in older adults",
+]
+
+
+def make_articles(count: int, tag: str) -> List[Dict[str, str]]:
+    """Distinct synthetic articles (the tag keeps scenarios from sharing cache entries)."""
+    articles = []
+    for i in range(count):
+        topic = TOPICS[i % len(TOPICS)]
+        articles.append({
+            "title": f"{topic} ({tag} {i})",
+            "description": f"Officials and analysts react as {topic.lower()}.",
+            "content": " ".join(
+                f"{topic}. Reporters describe the situation in detail ({tag} {i}), citing officials, data and expert reaction number {n}."
+                for n in range(12)
+            ),
+            "url": f"https://bench.example/{tag}/{i}"
+        })
+    return articles
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 1),
+        "p50_ms": round(pick(0.5) * 1000, 1),
+        "p95_ms": round(pick(0.95) * 1000, 1),
+        "p99_ms": round(pick(0.99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1)
+    }
+
+
+class Bench:
+    """Shared simulator control plus helpers to build a freshly configured AIService per run."""
+
+    def __init__(self, simulator_url: str, concurrency: int):
+        self.simulator_url = simulator_url.rstrip("/")
+        self.concurrency = concurrency
+        self.control = httpx.Client(base_url=self.simulator_url, timeout=10.0)
+
+    def configure(self, profiles: Dict[str, Dict[str, Any]]):
+        """Reset the simulator, restore default profiles, then apply `profiles`."""
+        defaults = {"median": 0.3, "p95": 0.6, "error_rate": 0.0, "rate_limit_rate": 0.0, "rpm": 0}
+        self.control.post("/_sim/config", json={
+            name: {**defaults, **profiles.get(name, {})} for name in ("openai", "groq", "claude", "ollama", "gemini")
+        }).raise_for_status()
+        self.control.post("/_sim/reset").raise_for_status()
+
+    def sim_stats(self) -> Dict[str, Any]:
+        return self.control.get("/_sim/stats").json()
+
+    @contextmanager
+    def environment(self, providers: List[str], **overrides: str):
+        """Temporarily expose only `providers` (first one preferred) plus extra settings."""
+        host_port = self.simulator_url.split("://", 1)[-1]
+        host, _, port = host_port.partition(":")
+        env = dict(base_urls(host, int(port or 80)))
+        for name, key in PROVIDER_KEYS.items():
+            env[key] = "simulated" if name in providers else ""
+        env["ANTHROPIC_API_KEY"] = ""
+        env["AI_PROVIDER"] = providers[0] if providers else "local"
+        if "ollama" not in providers:
+            env["OLLAMA_BASE_URL"] = ""
+        env.update(overrides)
+        saved = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        try:
+            yield
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def service(self, providers: List[str], **overrides: str):
+        from services.ai_service import AIService
+        with self.environment(providers, **overrides):
+            return AIService()
+
+    async def drive(self, service, articles: List[Dict[str, str]], with_url: bool = False) -> List[float]:
+        """Analyze `articles` with bounded concurrency; returns per-request latencies."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latencies = []
+
+        async def one(article):
+            async with semaphore:
+                started = time.perf_counter()
+                await service.analyze_article(
+                    article["title"], article["description"], article["content"],
+                    url=article["url"] if with_url else None
+                )
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one(article) for article in articles))
+        return latencies
+
+
+async def scenario_routing(bench: Bench, requests: int) -> Dict[str, Any]:
+    """Three providers, one with a heavy tail and one flaky; hedging should cut the tail."""
+    profiles = {
+        "openai": {"median": 0.25, "p95": 2.5},
+        "claude": {"median": 0.35, "p95": 0.6},
+        "groq": {"median": 0.3, "p95": 0.5, "error_rate": 0.1}
+    }
+    report = {}
+    for hedging in ("true", "false"):
+        bench.configure(profiles)
+        service = bench.service(["openai", "claude", "groq"], AI_HEDGE_ENABLED=hedging, AI_HEDGE_DEFAULT_DELAY_MS="800")
+        latencies = await bench.drive(service, make_articles(requests, f"routing-{hedging}"))
+        router = service.router.stats()
+        sim = bench.sim_stats()
+        report["hedging_on" if hedging == "true" else "hedging_off"] = {
+            **summarize_latencies(latencies),
+            "provider_requests": sum(sim[name]["requests"] for name in profiles),
+            "share": {name: router["providers"][name]["requests"] for name in profiles},
+            "hedges_fired": sum(router["providers"][name]["hedges_fired"] for name in profiles),
+            "hedge_wins": sum(router["providers"][name]["hedge_wins"] for name in profiles)
+        }
+        await service.aclose()
+    return report
+
+
+async def scenario_rate_limits(bench: Bench, requests: int) -> Dict[str, Any]:
+    """
+    The preferred provider enforces a requests-per-minute limit below the offered load.
+
+    Without the scheduler the excess requests hit 429s (which the SDKs retry
+    after Retry-After); with AI_OPENAI_RPM matching the limit they are held
+    back locally and the router sends the overflow to the second provider
+    (whose own default limit is lifted so it does not become the bottleneck).
+    """
+    rpm = max(1, requests // 2)
+    profiles = {"openai": {"median": 0.2, "p95": 0.4, "rpm": rpm}, "claude": {"median": 0.4, "p95": 0.8}}
+    report = {}
+    for scheduler in ("true", "false"):
+        bench.configure(profiles)
+        service = bench.service(["openai", "claude"], AI_SCHEDULER_ENABLED=scheduler, AI_OPENAI_RPM=str(rpm), AI_CLAUDE_RPM="0")
+        latencies = await bench.drive(service, make_articles(requests, f"limits-{scheduler}"))
+        sim = bench.sim_stats()
+        report["scheduler_on" if scheduler == "true" else "scheduler_off"] = {
+            **summarize_latencies(latencies),
+            "provider_rpm": rpm,
+            "rate_limited_responses": sim["openai"]["rate_limited"],
+            "served": {name: sim[name]["requests"] - sim[name]["rate_limited"] - sim[name]["errors"] for name in profiles}
+        }
+        await service.aclose()
+    return report
+
+
+async def scenario_caching(bench: Bench, requests: int) -> Dict[str, Any]:
+    """Bursts of duplicate requests (single-flight) followed by a repeat visit (result store)."""
+    from database.async_db import AsyncDatabase
+
+    bench.configure({"openai": {"median": 0.3, "p95": 0.5}})
+    unique = max(1, requests // 5)
+    articles = make_articles(unique, "caching")
+    with tempfile.TemporaryDirectory() as tmp, bench.environment(["openai"], DATABASE_URL=""):
+        service = bench.service(["openai"])
+        store = AsyncDatabase(db_path=str(Path(tmp) / "bench.db"))
+        service.attach_store(store)
+
+        burst = [article for article in articles for _ in range(5)]
+        cold = await bench.drive(service, burst, with_url=True)
+        cold_calls = bench.sim_stats()["openai"]["requests"]
+        warm = await bench.drive(service, articles, with_url=True)
+        warm_calls = bench.sim_stats()["openai"]["requests"] - cold_calls
+        await service.aclose()
+        await store.close()
+    return {
+        "burst": {**summarize_latencies(cold), "requests": len(burst), "provider_calls": cold_calls},
+        "repeat": {**summarize_latencies(warm), "requests": len(articles), "provider_calls": warm_calls},
+        "store": service.store_stats
+    }
+
+
+async def scenario_batching(bench: Bench, requests: int) -> Dict[str, Any]:
+    """One packed request per AI_BATCH_MAX_ARTICLES articles vs one request per article."""
+    bench.configure({"openai": {"median": 0.4, "p95": 0.8}})
+    service = bench.service(["openai"])
+    articles = make_articles(requests, "batching")
+
+    started = time.perf_counter()
+    await service.analyze_articles(articles[: requests // 2])
+    packed_seconds = time.perf_counter() - started
+    packed_calls = bench.sim_stats()["openai"]["requests"]
+    packed_tokens = service.prompt_usage.stats()["providers"]["openai"]["prompt_tokens"]
+
+    started = time.perf_counter()
+    await bench.drive(service, articles[requests // 2:])
+    single_seconds = time.perf_counter() - started
+    usage = service.prompt_usage.stats()["providers"]["openai"]
+    await service.aclose()
+    half = requests // 2
+    return {
+        "packed": {"articles": half, "provider_calls": packed_calls, "seconds": round(packed_seconds, 3),
+                   "prompt_tokens_per_article": round(packed_tokens / max(half, 1), 1)},
+        "individual": {"articles": requests - half, "provider_calls": bench.sim_stats()["openai"]["requests"] - packed_calls,
+                       "seconds": round(single_seconds, 3),
+                       "prompt_tokens_per_article": round((usage["prompt_tokens"] - packed_tokens) / max(requests - half, 1), 1)}
+    }
+
+
+async def scenario_streaming(bench: Bench, requests: int) -> Dict[str, Any]:
+    """Time to the first SSE section compared with waiting for the whole analysis."""
+    bench.configure({"openai": {"median": 1.0, "p95": 1.5}})
+    service = bench.service(["openai"])
+    first, total = [], []
+    for article in make_articles(min(requests, 20), "streaming"):
+        started = time.perf_counter()
+        seen = False
+        async for _ in service.stream_article(article["title"], article["description"], article["content"]):
+            if not seen:
+                first.append(time.perf_counter() - started)
+                seen = True
+        total.append(time.perf_counter() - started)
+    await service.aclose()
+    return {"first_section": summarize_latencies(first), "complete": summarize_latencies(total)}
+
+
+async def scenario_fallback(bench: Bench, requests: int) -> Dict[str, Any]:
+    """Every provider fails, so the local models serve everything: the worst-case latency."""
+    bench.configure({name: {"median": 0.05, "p95": 0.1, "error_rate": 1.0} for name in ("openai", "claude")})
+    service = bench.service(["openai", "claude"])
+    articles = make_articles(min(requests, 40), "fallback")
+    latencies = await bench.drive(service, articles)
+    await service.aclose()
+    local_only = bench.service([])
+    started = time.perf_counter()
+    await local_only.analyze_articles(make_articles(min(requests, 40), "fallback-batch"))
+    seconds = round(time.perf_counter() - started, 3)
+    await local_only.aclose()
+    return {
+        "providers_failing": summarize_latencies(latencies),
+        "local_batch": {"articles": min(requests, 40), "seconds": seconds}
+    }
+
+
+def start_simulator(port: int, seed: int) -> str:
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(create_app(ProviderSimulator(seed=seed)), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("Provider simulator did not start")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def use_tiny_models(root: Path):
+    """Point the local fallback at tiny random models so the fallback scenario runs offline."""
+    from inference_backends import build_tiny_models
+    from ml_models.summarizer import summarizer
+    from ml_models.sentiment import sentiment_analyzer
+    models = build_tiny_models(root)
+    summarizer.model_name = summarizer.cache_model = models["summarization"]
+    sentiment_analyzer.model_name = sentiment_analyzer.cache_model = models["sentiment-analysis"]
+
+
+async def run(args) -> Dict[str, Any]:
+    bench = Bench(args.simulator_url or start_simulator(args.port, args.seed), args.concurrency)
+    results = {}
+    for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        print(f"⏱️  Running {name} scenario...", file=sys.stderr)
+        started = time.perf_counter()
+        results[name] = await globals()[f"scenario_{name}"](bench, args.requests)
+        results[name]["wall_seconds"] = round(time.perf_counter() - started, 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AIService against simulated LLM providers")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--simulator-url", help="use an already running provider_simulator.py")
+    parser.add_argument("--tiny", action="store_true", help="use tiny randomly initialized local models for fallbacks")
+    args = parser.parse_args()
+
+    # The result cache would answer repeated fallback texts without running the models
+    os.environ.setdefault("RESULT_CACHE_PATH", "")
+    tmp = tempfile.TemporaryDirectory()
+    if args.tiny:
+        use_tiny_models(Path(tmp.name))
+    try:
+        # Services log every call to stdout; keep stdout for the JSON report
+        with redirect_stdout(sys.stderr):
+            results = asyncio.run(run(args))
+        print(json.dumps(results, indent=2))
+    finally:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Local simulator of the LLM provider APIs used by AIService, for offline benchmarks.
+
+Implements the request/response shapes AIService sends and parses, returning
+schema-valid intelligence JSON (one analysis, or {"results": [...]} for
+packed batch prompts) after a simulated latency:
+
+    POST /openai/v1/chat/completions                   OpenAI chat completions (JSON or SSE stream)
+    POST /groq/v1/chat/completions                     Groq (same shape as OpenAI)
+    POST /anthropic/v1/messages                        Anthropic messages (JSON or SSE stream)
+    POST /ollama/api/generate                          Ollama generate (JSON or NDJSON stream)
+    POST /gemini/v1beta/models/{model}:generateContent Gemini REST (and :streamGenerateContent)
+
+    GET  /_sim/stats      per-provider request, error and concurrency counters
+    POST /_sim/config     {"openai": {"median": 0.4, "p95": 1.5, "error_rate": 0.1, ...}, ...}
+    POST /_sim/reset      clear counters and rate-limit windows
+
+Point AIService at it with the base-URL overrides (any non-empty API keys):
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/openai/v1
+    GROQ_BASE_URL=http://127.0.0.1:8900/groq/v1
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8900/anthropic
+    OLLAMA_BASE_URL=http://127.0.0.1:8900/ollama
+    GEMINI_BASE_URL=http://127.0.0.1:8900/gemini
+
+Usage (from the backend directory):
+    python benchmarks/provider_simulator.py --port 8900
+    python benchmarks/provider_simulator.py --profile openai=median:0.8,p95:3,error_rate:0.05 --profile claude=rpm:50
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.prompts import estimate_tokens
+
+PROVIDERS = ("openai", "groq", "claude", "ollama", "gemini")
+
+ARTICLE_HEADER = re.compile(r"\[Article id=([^\]]+)\]")
+TITLE_LINE = re.compile(r"^Title: (.*)$", re.MULTILINE)
+PROMPT_LEAD_IN = re.compile(r"Articles? to analyze[^\n]*\n")
+LEANINGS = ("Left", "Center-Left", "Center", "Center-Right", "Right")
+LABELS = ("POSITIVE", "NEGATIVE", "NEUTRAL")
+
+# Share of the sampled latency spent before the first streamed chunk
+FIRST_CHUNK_SHARE = 0.2
+STREAM_CHUNK_CHARS = 48
+# How long a prompt prefix stays in the simulated provider cache
+PREFIX_CACHE_TTL = 300.0
+
+
+class ProviderProfile:
+    """Latency distribution and fault injection settings for one simulated provider."""
+
+    FIELDS = ("median", "p95", "error_rate", "rate_limit_rate", "rpm", "retry_after")
+
+    def __init__(
+        self,
+        median: float = 0.5,
+        p95: float = 1.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        rpm: int = 0,
+        retry_after: float = 1.0
+    ):
+        self.median = median
+        self.p95 = p95
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rpm = rpm
+        self.retry_after = retry_after
+
+    def update(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            if key not in self.FIELDS:
+                raise ValueError(f"Unknown profile field: {key}")
+            setattr(self, key, type(getattr(self, key))(value))
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Log-normal latency with the configured median and p95."""
+        if self.median <= 0:
+            return 0.0
+        sigma = math.log(max(self.p95, self.median) / self.median) / 1.645
+        return rng.lognormvariate(math.log(self.median), sigma)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class ProviderSimulator:
+    """Shared state behind the simulated endpoints: profiles, counters and rate-limit windows."""
+
+    def __init__(self, profiles: Optional[Dict[str, ProviderProfile]] = None, seed: int = 0):
+        self.profiles = {name: ProviderProfile() for name in PROVIDERS}
+        self.profiles.update(profiles or {})
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.windows = {name: deque() for name in PROVIDERS}
+        self.prefixes: Dict[str, float] = {}
+        self.counters = {
+            name: {
+                "requests": 0, "streamed": 0, "articles": 0, "errors": 0, "rate_limited": 0,
+                "in_flight": 0, "peak_in_flight": 0, "busy_seconds": 0.0
+            }
+            for name in PROVIDERS
+        }
+
+    def admit(self, provider: str) -> Optional[Tuple[int, float]]:
+        """Decide whether to fail this request: (status, retry_after) or None to serve it."""
+        profile = self.profiles[provider]
+        counters = self.counters[provider]
+        counters["requests"] += 1
+        now = time.monotonic()
+        window = self.windows[provider]
+        while window and now - window[0] > 60.0:
+            window.popleft()
+        if (profile.rpm and len(window) >= profile.rpm) or self.rng.random() < profile.rate_limit_rate:
+            counters["rate_limited"] += 1
+            retry_after = 60.0 - (now - window[0]) if profile.rpm and len(window) >= profile.rpm else profile.retry_after
+            return 429, max(retry_after, 0.0)
+        window.append(now)
+        if self.rng.random() < profile.error_rate:
+            counters["errors"] += 1
+            return 500, 0.0
+        return None
+
+    def cached_prefix(self, provider: str, system: str) -> bool:
+        """True if `provider` saw this prompt prefix recently (simulated provider prompt cache)."""
+        key = provider + ":" + hashlib.sha256(system.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+        hit = now - self.prefixes.get(key, -PREFIX_CACHE_TTL) < PREFIX_CACHE_TTL
+        self.prefixes[key] = now
+        return hit
+
+    async def run(self, provider: str, articles: int, stream: bool = False):
+        """Account for one served request and sleep for its latency (streams sleep per chunk instead)."""
+        counters = self.counters[provider]
+        counters["articles"] += articles
+        counters["streamed"] += int(stream)
+        latency = self.profiles[provider].sample_latency(self.rng)
+        if not stream:
+            await self._busy(provider, latency)
+        return latency
+
+    async def _busy(self, provider: str, seconds: float):
+        counters = self.counters[provider]
+        counters["in_flight"] += 1
+        counters["peak_in_flight"] = max(counters["peak_in_flight"], counters["in_flight"])
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            counters["in_flight"] -= 1
+            counters["busy_seconds"] += seconds
+
+    async def chunks(self, provider: str, text: str, latency: float):
+        """Split `text` into stream chunks, paced so the whole stream takes `latency`."""
+        pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+        gap = latency * (1.0 - FIRST_CHUNK_SHARE) / len(pieces)
+        await self._busy(provider, latency * FIRST_CHUNK_SHARE)
+        for i, piece in enumerate(pieces):
+            if i:
+                await self._busy(provider, gap)
+            yield piece
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                **{key: round(value, 3) if isinstance(value, float) else value for key, value in self.counters[name].items()},
+                "profile": self.profiles[name].to_dict()
+            }
+            for name in PROVIDERS
+        }
+
+
+def analysis_for(title: str) -> Dict[str, Any]:
+    """Deterministic, schema-valid analysis derived from the article title."""
+    digest = int(hashlib.sha256(title.encode("utf-8")).hexdigest(), 16)
+    words = [word.lower() for word in re.findall(r"[A-Za-z]{4,}", title)] or ["news"]
+    return {
+        "summary": {
+            "one_minute": f"Simulated summary of '{title}'. The article reports a development and its immediate context. Analysts expect follow-up coverage.",
+            "tldr": [f"{title[:60]} is the main development.", "Officials and analysts responded.", "Further updates are expected."],
+            "eli10": f"Something important happened: {title.lower()}."
+        },
+        "sentiment": {"label": LABELS[digest % 3], "score": round(0.5 + (digest % 50) / 100, 2)},
+        "political_analysis": {
+            "leaning": LEANINGS[digest % 5],
+            "confidence": round(0.5 + (digest % 40) / 100, 2),
+            "bias_description": "Simulated assessment: the framing is largely factual."
+        },
+        "domain_impact": {
+            "politics": "Low - simulated.",
+            "economy": "Medium - simulated.",
+            "business": "Medium - simulated.",
+            "technology": "Low - simulated.",
+            "environment": "None - simulated.",
+            "future_outlook": "Simulated outlook: expect further developments."
+        },
+        "key_insights": ["Simulated insight 1", "Simulated insight 2", "Simulated insight 3"],
+        "metadata": {"reading_difficulty": ("Easy", "Medium", "Hard")[digest % 3], "tags": list(dict.fromkeys(words))[:4]}
+    }
+
+
+def completion_for(user_text: str) -> Tuple[str, int]:
+    """JSON completion for a single-article or packed batch prompt, and the number of articles in it."""
+    ids = ARTICLE_HEADER.findall(user_text)
+    titles = TITLE_LINE.findall(user_text)
+    if ids:
+        results = [{"id": item_id, **analysis_for(title)} for item_id, title in zip(ids, titles)]
+        return json.dumps({"results": results}), len(results)
+    return json.dumps(analysis_for(titles[0] if titles else user_text[:60])), 1
+
+
+def _text_of(content: Any) -> str:
+    """Flatten an OpenAI/Anthropic message content (string or list of text blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content or [] if isinstance(block, dict))
+
+
+def sse(data: Any, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {data if isinstance(data, str) else json.dumps(data)}\n\n"
+
+
+def create_app(simulator: ProviderSimulator) -> FastAPI:
+    app = FastAPI(title="LLM provider simulator")
+
+    def fault(provider: str, shape: str) -> Optional[JSONResponse]:
+        decision = simulator.admit(provider)
+        if decision is None:
+            return None
+        status, retry_after = decision
+        message = "Rate limit exceeded (simulated)" if status == 429 else "Internal server error (simulated)"
+        if shape == "anthropic":
+            body = {"type": "error", "error": {"type": "rate_limit_error" if status == 429 else "api_error", "message": message}}
+        elif shape == "gemini":
+            body = {"error": {"code": status, "message": message, "status": "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"}}
+        elif shape == "ollama":
+            body = {"error": message}
+        else:
+            body = {"error": {"message": message, "type": "rate_limit_error" if status == 429 else "server_error"}}
+        headers = {"retry-after": str(math.ceil(retry_after))} if status == 429 else {}
+        return JSONResponse(status_code=status, content=body, headers=headers)
+
+    async def chat_completions(provider: str, request: Request):
+        payload = await request.json()
+        rejected = fault(provider, "openai")
+        if rejected:
+            return rejected
+        messages = payload.get("messages", [])
+        system = next((_text_of(m.get("content")) for m in messages if m.get("role") == "system"), "")
+        text, articles = completion_for(_text_of(messages[-1].get("content")) if messages else "")
+        prompt_tokens = estimate_tokens("".join(_text_of(m.get("content")) for m in messages))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": estimate_tokens(text),
+            "total_tokens": prompt_tokens + estimate_tokens(text),
+            "prompt_tokens_details": {"cached_tokens": estimate_tokens(system) if simulator.cached_prefix(provider, system) else 0}
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = payload.get("model", "simulated")
+        latency = await simulator.run(provider, articles, stream=bool(payload.get("stream")))
+
+        if not payload.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage
+            }
+
+        async def events():
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            async for piece in simulator.chunks(provider, text, latency):
+                yield sse({**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+            yield sse({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if (payload.get("stream_options") or {}).get("include_usage"):
+                yield sse({**base, "choices": [], "usage": usage})
+            yield sse("[DONE]")
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/openai/v1/chat/completions")
+    async def openai_chat(request: Request):
+        return await chat_completions("openai", request)
+
+    @app.post("/groq/v1/chat/completions")
+    async def groq_chat(request: Request):
+        return await chat_completions("groq", request)
+
+    @app.post("/anthropic/v1/messages")
+    async def anthropic_messages(request: Request):
+        payload = await request.json()
+        rejected = fault("claude", "anthropic")
+        if rejected:
+            return rejected
+        system_blocks = payload.get("system") or ""
+        system = _text_of(system_blocks)
+        messages = payload.get("messages", [])
+        text, articles = completion_for(_text_of(messages[-1].get("content")) if messages else "")
+        cacheable = isinstance(system_blocks, list) and any(block.get("cache_control") for block in system_blocks)
+        cached = cacheable and simulator.cached_prefix("claude", system)
+        system_tokens = estimate_tokens(system)
+        usage = {
+            "input_tokens": estimate_tokens("".join(_text_of(m.get("content")) for m in messages)) + (0 if cacheable else system_tokens),
+            "output_tokens": estimate_tokens(text),
+            "cache_read_input_tokens": system_tokens if cached else 0,
+            "cache_creation_input_tokens": system_tokens if cacheable and not cached else 0
+        }
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+        model = payload.get("model", "simulated")
+        latency = await simulator.run("claude", articles, stream=bool(payload.get("stream")))
+
+        message = {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage
+        }
+        if not payload.get("stream"):
+            return message
+
+        async def events():
+            yield sse({"type": "message_start", "message": {**message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 1}}}, "message_start")
+            yield sse({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}, "content_block_start")
+            async for piece in simulator.chunks("claude", text, latency):
+                yield sse({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}}, "content_block_delta")
+            yield sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+            yield sse({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": usage["output_tokens"]}}, "message_delta")
+            yield sse({"type": "message_stop"}, "message_stop")
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/ollama/api/generate")
+    async def ollama_generate(request: Request):
+        payload = await request.json()
+        rejected = fault("ollama", "ollama")
+        if rejected:
+            return rejected
+        text, articles = completion_for(payload.get("prompt", ""))
+        prompt_tokens = estimate_tokens(payload.get("system", "") + payload.get("prompt", ""))
+        model = payload.get("model", "simulated")
+        stream = payload.get("stream", True)
+        latency = await simulator.run("ollama", articles, stream=stream)
+        final = {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "done": True,
+            "prompt_eval_count": prompt_tokens,
+            "eval_count": estimate_tokens(text)
+        }
+        if not stream:
+            return {**final, "response": text}
+
+        async def lines():
+            async for piece in simulator.chunks("ollama", text, latency):
+                yield json.dumps({"model": model, "response": piece, "done": False}) + "\n"
+            yield json.dumps({**final, "response": ""}) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.post("/gemini/{version}/models/{target}")
+    async def gemini_generate(version: str, target: str, request: Request):
+        payload = await request.json()
+        rejected = fault("gemini", "gemini")
+        if rejected:
+            return rejected
+        full_text = "".join(
+            part.get("text", "") for content in payload.get("contents", []) for part in content.get("parts", [])
+        )
+        # Gemini gets prefix and articles as one text; only what follows the prompt's lead-in is article data
+        text, articles = completion_for(PROMPT_LEAD_IN.split(full_text)[-1])
+        stream = target.endswith(":streamGenerateContent")
+        latency = await simulator.run("gemini", articles, stream=stream)
+        usage = {
+            "promptTokenCount": estimate_tokens(full_text),
+            "candidatesTokenCount": estimate_tokens(text),
+            "totalTokenCount": estimate_tokens(full_text) + estimate_tokens(text)
+        }
+
+        def candidate(piece: str, finish: Optional[str] = None) -> Dict[str, Any]:
+            entry = {"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}
+            if finish:
+                entry["finishReason"] = finish
+            return entry
+
+        if not stream:
+            return {"candidates": [candidate(text, "STOP")], "usageMetadata": usage}
+
+        async def events():
+            pieces = []
+            async for piece in simulator.chunks("gemini", text, latency):
+                pieces.append(piece)
+                yield sse({"candidates": [candidate(piece)]})
+            yield sse({"candidates": [candidate("", "STOP")], "usageMetadata": usage})
+        if request.query_params.get("alt") == "sse":
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        # Without alt=sse Gemini streams a JSON array of responses
+        async def array():
+            yield "["
+            first = True
+            async for event in events():
+                yield ("" if first else ",") + event[len("data: "):].strip()
+                first = False
+            yield "]"
+        return StreamingResponse(array(), media_type="application/json")
+
+    @app.get("/_sim/stats")
+    async def sim_stats():
+        return simulator.stats()
+
+    @app.post("/_sim/config")
+    async def sim_config(request: Request):
+        try:
+            for provider, values in (await request.json()).items():
+                if provider not in simulator.profiles:
+                    raise ValueError(f"Unknown provider: {provider}")
+                simulator.profiles[provider].update(values)
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+        return {name: profile.to_dict() for name, profile in simulator.profiles.items()}
+
+    @app.post("/_sim/reset")
+    async def sim_reset():
+        simulator.reset()
+        return {"status": "reset"}
+
+    return app
+
+
+def parse_profile(spec: str) -> Tuple[str, Dict[str, str]]:
+    """Parse 'openai=median:0.8,p95:3,error_rate:0.05' into ("openai", {...})."""
+    provider, _, fields = spec.partition("=")
+    if provider not in PROVIDERS:
+        raise argparse.ArgumentTypeError(f"Unknown provider '{provider}' (choose from {', '.join(PROVIDERS)})")
+    values = {}
+    for field in filter(None, fields.split(",")):
+        key, _, value = field.partition(":")
+        values[key] = value
+    return provider, values
+
+
+def base_urls(host: str, port: int) -> Dict[str, str]:
+    """Environment overrides that point every AIService provider at a simulator."""
+    root = f"http://{host}:{port}"
+    return {
+        "OPENAI_BASE_URL": f"{root}/openai/v1",
+        "GROQ_BASE_URL": f"{root}/groq/v1",
+        "ANTHROPIC_BASE_URL": f"{root}/anthropic",
+        "OLLAMA_BASE_URL": f"{root}/ollama",
+        "GEMINI_BASE_URL": f"{root}/gemini"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the OpenAI/Anthropic/Ollama/Gemini APIs used by AIService")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", action="append", type=parse_profile, default=[],
+                        help="provider=field:value,... (fields: " + ", ".join(ProviderProfile.FIELDS) + ")")
+    args = parser.parse_args()
+
+    simulator = ProviderSimulator(seed=args.seed)
+    for provider, values in args.profile:
+        simulator.profiles[provider].update(values)
+
+    import uvicorn
+    for name, value in base_urls(args.host, args.port).items():
+        print(f"{name}={value}")
+    uvicorn.run(create_app(simulator), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+import os
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from database.db import (
+    Database,
+    favorite_row,
+    favorite_from_row,
+    encode_cursor,
+    FAVORITE_COLUMNS,
+    FETCH_BATCH_SIZE,
+    DEFAULT_USER,
+    FAVORITES_INDEXES,
+    POSTGRES_FAVORITES_MIGRATION,
+    POOL_MIN_SIZE,
+    POOL_MAX_SIZE,
+    POSTGRES_FAVORITES_TABLE,
+    INTELLIGENCE_CACHE_TABLE
+)
+
+# Seconds a query may wait for a free connection (or worker slot) before giving up
+ACQUIRE_TIMEOUT = float(os.getenv("DB_ACQUIRE_TIMEOUT", "5"))
+
+
+class AsyncDatabase:
+    """
+    Non-blocking interface to the favorites and intelligence tables.
+
+    With a Postgres DATABASE_URL, queries run on a psycopg 3 AsyncConnectionPool
+    (native async I/O, autocommit, DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections).
+    Otherwise, or when psycopg 3 is not installed, the blocking Database runs
+    on a dedicated thread pool with one worker per pool slot, so SQLite calls
+    never block the event loop or compete with the request threadpool.
+
+    Either way a query waits at most DB_ACQUIRE_TIMEOUT seconds for a
+    connection, and every method keeps Database's semantics: errors and
+    timeouts are logged and reported as False / None / [] / 0.
+    """
+
+    def __init__(self, db_path: str = "news_aggregator.db"):
+        self.db_path = db_path
+        self.db_url = os.getenv("DATABASE_URL")
+        self.is_postgres = bool(self.db_url) and self.db_url.startswith(("postgresql://", "postgres://"))
+        self.min_size = min(POOL_MIN_SIZE, POOL_MAX_SIZE)
+        self.max_size = POOL_MAX_SIZE
+        self.acquire_timeout = ACQUIRE_TIMEOUT
+
+        # Exactly one of these is set after connect(): the async pool, or the blocking fallback
+        self.pool = None
+        self.sync: Optional[Database] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._busy_errors = (asyncio.TimeoutError,)
+        self._connecting: Optional[asyncio.Lock] = None
+
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def driver(self) -> str:
+        if self.pool is not None:
+            return "psycopg-async"
+        return "threaded" if self.sync is not None else "unconnected"
+
+    async def connect(self):
+        """Open the connection pool and create tables. Called at startup; queries also connect lazily."""
+        if self.pool is not None or self.sync is not None:
+            return
+        if self._connecting is None:
+            self._connecting = asyncio.Lock()
+        async with self._connecting:
+            if self.pool is not None or self.sync is not None:
+                return
+            if self.is_postgres and await self._open_pool():
+                return
+            # Blocking driver (SQLite, or psycopg2 when psycopg 3 is unavailable) on its own workers
+            self.executor = ThreadPoolExecutor(max_workers=self.max_size, thread_name_prefix="db")
+            self._slots = asyncio.Semaphore(self.max_size)
+            self.sync = await asyncio.get_running_loop().run_in_executor(self.executor, Database, self.db_path)
+            self.is_postgres = self.sync.is_postgres
+
+    async def _open_pool(self) -> bool:
+        try:
+            from psycopg_pool import AsyncConnectionPool, PoolTimeout
+        except ImportError:
+            print("⚠️ psycopg 3 not installed; running the blocking PostgreSQL driver on worker threads")
+            return False
+
+        pool = AsyncConnectionPool(
+            self.db_url,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            timeout=self.acquire_timeout,
+            kwargs={"autocommit": True},
+            name="newshub",
+            open=False
+        )
+        try:
+            await pool.open(wait=True, timeout=self.acquire_timeout)
+            async with pool.connection() as conn:
+                await conn.execute(POSTGRES_FAVORITES_TABLE)
+                for statement in POSTGRES_FAVORITES_MIGRATION + FAVORITES_INDEXES:
+                    await conn.execute(statement)
+                # LLM intelligence results, reused across viewers until the article text or prompt version changes
+                await conn.execute(INTELLIGENCE_CACHE_TABLE)
+        except Exception as e:
+            print(f"❌ Error opening PostgreSQL async pool: {e}. Using the blocking driver.")
+            await pool.close()
+            return False
+
+        self.pool = pool
+        self._busy_errors = (asyncio.TimeoutError, PoolTimeout)
+        print(f"🔌 PostgreSQL async connection pool initialized ({self.min_size}-{self.max_size} connections)")
+        return True
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        if self.executor is not None:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.sync.close)
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            self.sync = None
+
+    async def _acquire(self):
+        """Wait for a pooled connection (Postgres) or a worker slot (blocking driver; returns None)."""
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            if self.pool is not None:
+                conn = await self.pool.getconn(timeout=self.acquire_timeout)
+            else:
+                await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+                conn = None
+        finally:
+            self.waiting -= 1
+        waited = time.perf_counter() - started
+        self.acquired += 1
+        self.in_use += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return conn
+
+    async def _release(self, conn):
+        self.in_use -= 1
+        if conn is not None:
+            await self.pool.putconn(conn)
+        else:
+            self._slots.release()
+
+    async def _run(self, name: str, default: Any, query: Callable[..., Awaitable[Any]], *args) -> Any:
+        """
+        Run one operation: `query(conn, *args)` on the Postgres pool, or Database.<name>(*args) on a worker.
+
+        Returns:
+            The operation's result, or `default` if no connection freed up in time or the query failed
+        """
+        await self.connect()
+        try:
+            conn = await self._acquire()
+        except self._busy_errors:
+            self.timeouts += 1
+            print(f"⏳ Database {name} gave up after waiting {self.acquire_timeout}s for a connection")
+            return default
+        except Exception as e:
+            self.errors += 1
+            print(f"Error acquiring database connection for {name}: {e}")
+            return default
+        try:
+            if conn is None:
+                return await asyncio.get_running_loop().run_in_executor(self.executor, getattr(self.sync, name), *args)
+            return await query(conn, *args)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error in database {name}: {e}")
+            return default
+        finally:
+            await self._release(conn)
+
+    async def ping(self) -> bool:
+        """Check that the database accepts queries (used by the readiness probe)."""
+        return await self._run("ping", False, self._pg_ping)
+
+    async def get_intelligence(self, url: str, content_hash: str, prompt_version: str) -> Optional[dict]:
+        """Look up a stored intelligence analysis for this exact article text and prompt version."""
+        return await self._run("get_intelligence", None, self._pg_get_intelligence, url, content_hash, prompt_version)
+
+    async def save_intelligence(self, url: str, content_hash: str, prompt_version: str, provider: str, analysis: dict) -> bool:
+        """Store (or replace) an intelligence analysis."""
+        return await self._run(
+            "save_intelligence", False, self._pg_save_intelligence, url, content_hash, prompt_version, provider, analysis
+        )
+
+    async def save_intelligence_many(self, rows: List[Tuple[str, str, str, str, dict]]) -> bool:
+        """Store (or replace) many (url, content_hash, prompt_version, provider, analysis) rows in one round of writes."""
+        if not rows:
+            return True
+        return await self._run("save_intelligence_many", False, self._pg_save_intelligence_many, rows)
+
+    async def purge_intelligence(self, prompt_version: str) -> int:
+        """Delete analyses produced by any other prompt version; returns the number of rows removed."""
+        return await self._run("purge_intelligence", 0, self._pg_purge_intelligence, prompt_version)
+
+    async def add_favorite(self, article: dict, user_id: str = DEFAULT_USER) -> bool:
+        """Add an article to a user's favorites."""
+        return await self._write_favorites("add_favorites", user_id, self._pg_add_favorites, [article])
+
+    async def add_favorites(self, articles: List[dict], user_id: str = DEFAULT_USER) -> bool:
+        """Add many articles to a user's favorites in one round of writes (already-saved URLs are skipped)."""
+        if not articles:
+            return True
+        return await self._write_favorites("add_favorites", user_id, self._pg_add_favorites, articles)
+
+    async def remove_favorite(self, url: str, user_id: str = DEFAULT_USER) -> bool:
+        """Remove an article from a user's favorites by URL."""
+        return await self._write_favorites("remove_favorites", user_id, self._pg_remove_favorites, [url])
+
+    async def remove_favorites(self, urls: List[str], user_id: str = DEFAULT_USER) -> bool:
+        """Remove many articles from a user's favorites with one statement."""
+        if not urls:
+            return True
+        return await self._write_favorites("remove_favorites", user_id, self._pg_remove_favorites, urls)
+
+    async def get_favorites(self, user_id: str = DEFAULT_USER) -> List[dict]:
+        """Get all of a user's favorite articles."""
+        return await self._run("get_favorites", [], self._pg_get_favorites, user_id)
+
+    async def get_favorites_page(
+        self,
+        limit: int,
+        before: Optional[Tuple[str, int]] = None,
+        user_id: str = DEFAULT_USER
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One newest-first page of a user's favorites and the cursor for the next one (None on the last page)."""
+        return await self._run("get_favorites_page", ([], None), self._pg_get_favorites_page, limit, before, user_id)
+
+    async def count_favorites(self, user_id: str = DEFAULT_USER) -> int:
+        """Number of favorites a user has saved (cached per list version by FavoritesCache.count)."""
+        return await self._run("count_favorites", 0, self._pg_count_favorites, user_id)
+
+    async def is_favorite(self, url: str, user_id: str = DEFAULT_USER) -> bool:
+        """Check if an article is already in a user's favorites."""
+        return url in await self.favorite_urls([url], user_id)
+
+    async def favorite_urls(self, urls: List[str], user_id: str = DEFAULT_USER) -> Set[str]:
+        """The subset of `urls` the user has saved, answered with one query."""
+        if not urls:
+            return set()
+        return await self._run("favorite_urls", set(), self._pg_favorite_urls, urls, user_id)
+
+    async def _write_favorites(self, name: str, user_id: str, query: Callable[..., Awaitable[Any]], items: List[Any]) -> bool:
+        """Run a bulk favorites write; `name` is the Database method used on the blocking fallback."""
+        return await self._run(name, False, query, items, user_id)
+
+    # PostgreSQL queries (autocommit connections: each statement is its own transaction)
+
+    async def _pg_ping(self, conn) -> bool:
+        cursor = await conn.execute('SELECT 1')
+        await cursor.fetchone()
+        return True
+
+    async def _pg_get_intelligence(self, conn, url: str, content_hash: str, prompt_version: str) -> Optional[dict]:
+        cursor = await conn.execute('''
+            SELECT analysis FROM intelligence_cache
+            WHERE url = %s AND content_hash = %s AND prompt_version = %s
+        ''', (url, content_hash, prompt_version))
+        row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def _pg_save_intelligence(self, conn, url: str, content_hash: str, prompt_version: str, provider: str, analysis: dict) -> bool:
+        return await self._pg_save_intelligence_many(conn, [(url, content_hash, prompt_version, provider, analysis)])
+
+    async def _pg_save_intelligence_many(self, conn, rows: List[Tuple[str, str, str, str, dict]]) -> bool:
+        # One transaction; psycopg pipelines executemany so the rows share round trips
+        async with conn.transaction():
+            async with conn.cursor() as cursor:
+                await cursor.executemany('''
+                    INSERT INTO intelligence_cache (url, content_hash, prompt_version, provider, analysis)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (url, content_hash, prompt_version)
+                    DO UPDATE SET provider = EXCLUDED.provider, analysis = EXCLUDED.analysis, created_at = CURRENT_TIMESTAMP
+                ''', [(url, digest, version, provider, json.dumps(analysis)) for url, digest, version, provider, analysis in rows])
+        return True
+
+    async def _pg_purge_intelligence(self, conn, prompt_version: str) -> int:
+        cursor = await conn.execute('DELETE FROM intelligence_cache WHERE prompt_version <> %s', (prompt_version,))
+        return cursor.rowcount
+
+    async def _pg_add_favorites(self, conn, articles: List[dict], user_id: str) -> bool:
+        async with conn.transaction():
+            async with conn.cursor() as cursor:
+                await cursor.executemany('''
+                    INSERT INTO favorites (user_id, title, description, url, urlToImage, publishedAt, source_name)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (user_id, url) DO NOTHING
+                ''', [(user_id, *favorite_row(article)) for article in articles])
+        return True
+
+    async def _pg_remove_favorites(self, conn, urls: List[str], user_id: str) -> bool:
+        await conn.execute('DELETE FROM favorites WHERE user_id = %s AND url = ANY(%s)', (user_id, list(urls)))
+        return True
+
+    async def _pg_get_favorites(self, conn, user_id: str) -> List[dict]:
+        favorites = []
+        async with conn.cursor() as cursor:
+            await cursor.execute(f'''
+                SELECT {FAVORITE_COLUMNS}
+                FROM favorites
+                WHERE user_id = %s
+                ORDER BY created_at DESC, id DESC
+            ''', (user_id,))
+            while True:
+                rows = await cursor.fetchmany(FETCH_BATCH_SIZE)
+                if not rows:
+                    break
+                favorites.extend(favorite_from_row(row) for row in rows)
+        return favorites
+
+    async def _pg_get_favorites_page(
+        self,
+        conn,
+        limit: int,
+        before: Optional[Tuple[str, int]],
+        user_id: str
+    ) -> Tuple[List[dict], Optional[str]]:
+        where = "WHERE user_id = %s" + (" AND (created_at, id) < (%s::timestamp, %s)" if before else "")
+        cursor = await conn.execute(f'''
+            SELECT {FAVORITE_COLUMNS}
+            FROM favorites
+            {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+        ''', (user_id, *(before or ()), limit + 1))
+        rows = await cursor.fetchmany(limit + 1)
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return [favorite_from_row(row) for row in rows[:limit]], next_cursor
+
+    async def _pg_count_favorites(self, conn, user_id: str) -> int:
+        cursor = await conn.execute('SELECT COUNT(*) FROM favorites WHERE user_id = %s', (user_id,))
+        return (await cursor.fetchone())[0]
+
+    async def _pg_favorite_urls(self, conn, urls: List[str], user_id: str) -> Set[str]:
+        cursor = await conn.execute('SELECT url FROM favorites WHERE user_id = %s AND url = ANY(%s)', (user_id, list(urls)))
+        return {row[0] for row in await cursor.fetchall()}
+
+    def stats(self) -> Dict[str, Any]:
+        report = {
+            "backend": "postgres" if self.is_postgres else "sqlite",
+            "driver": self.driver,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "acquire_timeout_seconds": self.acquire_timeout,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_wait_ms": round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2)
+        }
+        if self.pool is not None:
+            # psycopg_pool's own counters: pool_size, pool_available, requests_waiting, connections_lost, ...
+            report["pool"] = self.pool.get_stats()
+        return report
@@ -1,5 +1,133 @@
 import os
-from typing import List, Optional
+import json
+import base64
+import sqlite3
+import threading
+from typing import List, Optional, Set, Tuple
+
+# Pool bounds, shared with the async layer (database/async_db.py)
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = max(1, int(os.getenv("DB_POOL_MAX_SIZE", "10")))
+
+# SQLite tuning for the per-thread persistent connections
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_STATEMENT_CACHE = int(os.getenv("SQLITE_STATEMENT_CACHE", "256"))
+
+# Favorites owner when a request does not identify a user (and for rows saved before favorites were per user)
+DEFAULT_USER = "default"
+
+# PostgreSQL Serial Auto-increment syntax (uniqueness per user comes from FAVORITES_INDEXES)
+POSTGRES_FAVORITES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS favorites (
+        id SERIAL PRIMARY KEY,
+        user_id TEXT NOT NULL DEFAULT 'default',
+        title TEXT NOT NULL,
+        description TEXT,
+        url TEXT NOT NULL,
+        urlToImage TEXT,
+        publishedAt TEXT,
+        source_name TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# SQLite Auto-increment syntax
+SQLITE_FAVORITES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS favorites (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL DEFAULT 'default',
+        title TEXT NOT NULL,
+        description TEXT,
+        url TEXT NOT NULL,
+        urlToImage TEXT,
+        publishedAt TEXT,
+        source_name TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Upgrade a single-user favorites table (url UNIQUE, no user_id) in place; existing rows go to DEFAULT_USER
+POSTGRES_FAVORITES_MIGRATION = [
+    "ALTER TABLE favorites ADD COLUMN IF NOT EXISTS user_id TEXT NOT NULL DEFAULT 'default'",
+    "ALTER TABLE favorites DROP CONSTRAINT IF EXISTS favorites_url_key",
+    "DROP INDEX IF EXISTS idx_favorites_created"
+]
+
+# SQLite cannot drop a UNIQUE constraint, so the table is rebuilt (ids and timestamps are kept)
+SQLITE_FAVORITES_MIGRATION = f'''
+    BEGIN;
+    ALTER TABLE favorites RENAME TO favorites_single_user;
+    {SQLITE_FAVORITES_TABLE};
+    INSERT INTO favorites (id, user_id, title, description, url, urlToImage, publishedAt, source_name, created_at)
+    SELECT id, 'default', title, description, url, urlToImage, publishedAt, source_name, created_at
+    FROM favorites_single_user;
+    DROP TABLE favorites_single_user;
+    COMMIT;
+'''
+
+# One row per (user, url); newest-first pages per user are served straight from the second index (keyset pagination)
+FAVORITES_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_favorites_user_url ON favorites (user_id, url)",
+    "CREATE INDEX IF NOT EXISTS idx_favorites_user_created ON favorites (user_id, created_at DESC, id DESC)"
+]
+
+# Bound on URLs per IN (...) list; stays under SQLite's host-parameter limit
+SQLITE_MAX_IN_LIST = 500
+
+INTELLIGENCE_CACHE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS intelligence_cache (
+        url TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        provider TEXT,
+        analysis TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (url, content_hash, prompt_version)
+    )
+'''
+
+# Rows pulled per fetchmany() call when reading whole result sets
+FETCH_BATCH_SIZE = int(os.getenv("DB_FETCH_BATCH_SIZE", "200"))
+
+FAVORITE_COLUMNS = "id, title, description, url, urlToImage, publishedAt, source_name, created_at"
+
+def favorite_from_row(row: tuple) -> dict:
+    """Favorite dict from a FAVORITE_COLUMNS row."""
+    return {
+        'title': row[1],
+        'description': row[2],
+        'url': row[3],
+        'urlToImage': row[4],
+        'publishedAt': row[5],
+        'source': {'name': row[6]},
+        'created_at': str(row[7]) # Convert datetime object to string
+    }
+
+def encode_cursor(row: tuple) -> str:
+    """Opaque page cursor pointing just past a FAVORITE_COLUMNS row (its created_at and id)."""
+    return base64.urlsafe_b64encode(f"{row[7]}|{row[0]}".encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """(created_at, id) from a cursor made by encode_cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return created_at, int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def favorite_row(article: dict) -> tuple:
+    """Column values (title, description, url, urlToImage, publishedAt, source_name) for a favorites insert."""
+    return (
+        article.get('title', ''),
+        article.get('description', ''),
+        article.get('url', ''),
+        article.get('urlToImage', ''),
+        article.get('publishedAt', ''),
+        article.get('source', {}).get('name', '')
+    )
 
 class Database:
     def __init__(self, db_path: str = "news_aggregator.db"):
@@ -7,16 +135,19 @@ class Database:
         self.db_url = os.getenv("DATABASE_URL")
         self.is_postgres = False
         self.pool = None
+        # SQLite: one long-lived connection per thread (every one tracked so close() can reach them)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
 
         # Detect database URL and configure connection pooling
         if self.db_url and (self.db_url.startswith("postgresql://") or self.db_url.startswith("postgres://")):
             self.is_postgres = True
             try:
-                import psycopg2
-                from psycopg2.pool import SimpleConnectionPool
+                from psycopg2.pool import ThreadedConnectionPool
                 
-                # Setup a connection pool for concurrent environments (min 1, max 10 conns)
-                self.pool = SimpleConnectionPool(1, 10, self.db_url)
+                # Setup a thread-safe connection pool (handlers call us from worker threads; DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE conns)
+                self.pool = ThreadedConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE, self.db_url)
                 print("🔌 PostgreSQL Connection Pool initialized successfully")
             except Exception as e:
                 print(f"❌ Error setting up PostgreSQL Connection Pool: {e}. Falling back to SQLite.")
@@ -25,19 +156,59 @@ class Database:
         self.init_database()
     
     def get_connection(self):
-        """Get database connection from pool or file."""
+        """Get database connection from pool or this thread's persistent SQLite connection."""
         if self.is_postgres:
             return self.pool.getconn()
-        else:
-            import sqlite3
-            return sqlite3.connect(self.db_path)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_sqlite()
+            self._local.conn = conn
+        return conn
+
+    def _open_sqlite(self):
+        """
+        Open a tuned SQLite connection.
+
+        WAL lets readers run alongside the single writer, and synchronous=NORMAL
+        skips the per-commit fsync (WAL stays consistent; only the latest
+        commits can be lost on power failure). Writers that find the database
+        locked wait up to SQLITE_BUSY_TIMEOUT_MS instead of failing.
+        """
+        # check_same_thread=False only so close() can run from another thread; each connection stays with its thread
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
 
     def release_connection(self, conn):
-        """Release connection back to the pool or close it."""
+        """Release connection back to the pool (SQLite connections stay open for their thread)."""
         if self.is_postgres:
             self.pool.putconn(conn)
-        else:
+        elif conn.in_transaction:
+            # Never leave a write lock held on a persistent connection
+            conn.rollback()
+
+    def close(self):
+        """Close every pooled or per-thread connection."""
+        if self.is_postgres:
+            self.pool.closeall()
+            return
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
             conn.close()
+        self._local = threading.local()
 
     def init_database(self):
         """Initialize the database and create tables if they don't exist."""
@@ -47,33 +218,19 @@ class Database:
             cursor = conn.cursor()
             
             if self.is_postgres:
-                # PostgreSQL Serial Auto-increment syntax
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS favorites (
-                        id SERIAL PRIMARY KEY,
-                        title TEXT NOT NULL,
-                        description TEXT,
-                        url TEXT NOT NULL UNIQUE,
-                        urlToImage TEXT,
-                        publishedAt TEXT,
-                        source_name TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+                cursor.execute(POSTGRES_FAVORITES_TABLE)
+                for statement in POSTGRES_FAVORITES_MIGRATION:
+                    cursor.execute(statement)
             else:
-                # SQLite Auto-increment syntax
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS favorites (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        description TEXT,
-                        url TEXT NOT NULL UNIQUE,
-                        urlToImage TEXT,
-                        publishedAt TEXT,
-                        source_name TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+                cursor.execute(SQLITE_FAVORITES_TABLE)
+                cursor.execute("PRAGMA table_info(favorites)")
+                if "user_id" not in [column[1] for column in cursor.fetchall()]:
+                    cursor.executescript(SQLITE_FAVORITES_MIGRATION)
+                    print("🔄 Migrated favorites table to per-user rows")
+            for statement in FAVORITES_INDEXES:
+                cursor.execute(statement)
+            # LLM intelligence results, reused across viewers until the article text or prompt version changes
+            cursor.execute(INTELLIGENCE_CACHE_TABLE)
             
             conn.commit()
             print("✅ Database tables verified and initialized successfully")
@@ -85,40 +242,131 @@ class Database:
             if conn:
                 self.release_connection(conn)
     
-    def add_favorite(self, article: dict) -> bool:
-        """Add an article to favorites."""
+    def ping(self) -> bool:
+        """Check that the database accepts queries (used by the readiness probe)."""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            return True
+        except Exception as e:
+            print(f"Database ping failed: {e}")
+            return False
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
+    def get_intelligence(self, url: str, content_hash: str, prompt_version: str) -> Optional[dict]:
+        """Look up a stored intelligence analysis for this exact article text and prompt version."""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            placeholder = "%s" if self.is_postgres else "?"
+            cursor.execute(f'''
+                SELECT analysis FROM intelligence_cache
+                WHERE url = {placeholder} AND content_hash = {placeholder} AND prompt_version = {placeholder}
+            ''', (url, content_hash, prompt_version))
+            row = cursor.fetchone()
+            
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"Error reading intelligence cache: {e}")
+            return None
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
+    def save_intelligence(self, url: str, content_hash: str, prompt_version: str, provider: str, analysis: dict) -> bool:
+        """Store (or replace) an intelligence analysis."""
+        return self.save_intelligence_many([(url, content_hash, prompt_version, provider, analysis)])
+    
+    def save_intelligence_many(self, rows: List[Tuple[str, str, str, str, dict]]) -> bool:
+        """Store (or replace) many (url, content_hash, prompt_version, provider, analysis) rows in one transaction."""
+        if not rows:
+            return True
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            params = [(url, digest, version, provider, json.dumps(analysis)) for url, digest, version, provider, analysis in rows]
+            if self.is_postgres:
+                cursor.executemany('''
+                    INSERT INTO intelligence_cache (url, content_hash, prompt_version, provider, analysis)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (url, content_hash, prompt_version)
+                    DO UPDATE SET provider = EXCLUDED.provider, analysis = EXCLUDED.analysis, created_at = CURRENT_TIMESTAMP
+                ''', params)
+            else:
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO intelligence_cache (url, content_hash, prompt_version, provider, analysis)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', params)
+            
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error saving intelligence cache: {e}")
+            if conn:
+                conn.rollback()
+            return False
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
+    def purge_intelligence(self, prompt_version: str) -> int:
+        """Delete analyses produced by any other prompt version; returns the number of rows removed."""
         conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            placeholder = "%s" if self.is_postgres else "?"
+            cursor.execute(f'DELETE FROM intelligence_cache WHERE prompt_version <> {placeholder}', (prompt_version,))
+            removed = cursor.rowcount
+            
+            conn.commit()
+            return removed
+        except Exception as e:
+            print(f"Error purging intelligence cache: {e}")
+            if conn:
+                conn.rollback()
+            return 0
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
+    def add_favorite(self, article: dict, user_id: str = DEFAULT_USER) -> bool:
+        """Add an article to a user's favorites."""
+        return self.add_favorites([article], user_id)
+    
+    def add_favorites(self, articles: List[dict], user_id: str = DEFAULT_USER) -> bool:
+        """Add many articles to a user's favorites in one transaction (already-saved URLs are skipped)."""
+        if not articles:
+            return True
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            rows = [(user_id, *favorite_row(article)) for article in articles]
             if self.is_postgres:
-                # Postgres upsert logic using ON CONFLICT (url) DO NOTHING
-                cursor.execute('''
-                    INSERT INTO favorites (title, description, url, urlToImage, publishedAt, source_name)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (url) DO NOTHING
-                ''', (
-                    article.get('title', ''),
-                    article.get('description', ''),
-                    article.get('url', ''),
-                    article.get('urlToImage', ''),
-                    article.get('publishedAt', ''),
-                    article.get('source', {}).get('name', '')
-                ))
+                # Postgres upsert logic using ON CONFLICT (user_id, url) DO NOTHING
+                cursor.executemany('''
+                    INSERT INTO favorites (user_id, title, description, url, urlToImage, publishedAt, source_name)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (user_id, url) DO NOTHING
+                ''', rows)
             else:
                 # SQLite INSERT OR IGNORE syntax
-                cursor.execute('''
-                    INSERT OR IGNORE INTO favorites (title, description, url, urlToImage, publishedAt, source_name)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    article.get('title', ''),
-                    article.get('description', ''),
-                    article.get('url', ''),
-                    article.get('urlToImage', ''),
-                    article.get('publishedAt', ''),
-                    article.get('source', {}).get('name', '')
-                ))
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO favorites (user_id, title, description, url, urlToImage, publishedAt, source_name)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
             
             conn.commit()
             return True
@@ -131,32 +379,27 @@ class Database:
             if conn:
                 self.release_connection(conn)
     
-    def get_favorites(self) -> List[dict]:
-        """Get all favorite articles."""
+    def get_favorites(self, user_id: str = DEFAULT_USER) -> List[dict]:
+        """Get all of a user's favorite articles, newest first (read in FETCH_BATCH_SIZE batches)."""
         conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT title, description, url, urlToImage, publishedAt, source_name, created_at
+            placeholder = "%s" if self.is_postgres else "?"
+            cursor.execute(f'''
+                SELECT {FAVORITE_COLUMNS}
                 FROM favorites
-                ORDER BY created_at DESC
-            ''')
-            
-            rows = cursor.fetchall()
+                WHERE user_id = {placeholder}
+                ORDER BY created_at DESC, id DESC
+            ''', (user_id,))
             
             favorites = []
-            for row in rows:
-                favorites.append({
-                    'title': row[0],
-                    'description': row[1],
-                    'url': row[2],
-                    'urlToImage': row[3],
-                    'publishedAt': row[4],
-                    'source': {'name': row[5]},
-                    'created_at': str(row[6]) # Convert datetime object to string
-                })
+            while True:
+                rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+                if not rows:
+                    break
+                favorites.extend(favorite_from_row(row) for row in rows)
             
             return favorites
         except Exception as e:
@@ -166,15 +409,92 @@ class Database:
             if conn:
                 self.release_connection(conn)
     
-    def remove_favorite(self, url: str) -> bool:
-        """Remove an article from favorites by URL."""
+    def get_favorites_page(
+        self,
+        limit: int,
+        before: Optional[Tuple[str, int]] = None,
+        user_id: str = DEFAULT_USER
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        One page of a user's favorites, newest first, using keyset pagination.
+
+        Args:
+            limit: Page size
+            before: Decoded cursor from the previous page; None for the first page
+            user_id: Owner of the favorites
+
+        Returns:
+            (favorites, cursor for the next page or None when this is the last page)
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            # Seek past the cursor row on the (user_id, created_at, id) index instead of OFFSET, so every page costs the same
+            if self.is_postgres:
+                where = "WHERE user_id = %s" + (" AND (created_at, id) < (%s::timestamp, %s)" if before else "")
+                limit_clause = "LIMIT %s"
+            else:
+                where = "WHERE user_id = ?" + (" AND (created_at, id) < (?, ?)" if before else "")
+                limit_clause = "LIMIT ?"
+            cursor.execute(f'''
+                SELECT {FAVORITE_COLUMNS}
+                FROM favorites
+                {where}
+                ORDER BY created_at DESC, id DESC
+                {limit_clause}
+            ''', (user_id, *(before or ()), limit + 1))
+            rows = cursor.fetchmany(limit + 1)
+            
+            next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+            return [favorite_from_row(row) for row in rows[:limit]], next_cursor
+        except Exception as e:
+            print(f"Error getting favorites page: {e}")
+            return [], None
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
+    def count_favorites(self, user_id: str = DEFAULT_USER) -> int:
+        """Number of favorites a user has saved."""
         conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
             placeholder = "%s" if self.is_postgres else "?"
-            cursor.execute(f'DELETE FROM favorites WHERE url = {placeholder}', (url,))
+            cursor.execute(f'SELECT COUNT(*) FROM favorites WHERE user_id = {placeholder}', (user_id,))
+            return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error counting favorites: {e}")
+            return 0
+        finally:
+            if conn:
+                self.release_connection(conn)
+    
+    def remove_favorite(self, url: str, user_id: str = DEFAULT_USER) -> bool:
+        """Remove an article from a user's favorites by URL."""
+        return self.remove_favorites([url], user_id)
+    
+    def remove_favorites(self, urls: List[str], user_id: str = DEFAULT_USER) -> bool:
+        """Remove many articles from a user's favorites in one transaction."""
+        if not urls:
+            return True
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            if self.is_postgres:
+                cursor.execute('DELETE FROM favorites WHERE user_id = %s AND url = ANY(%s)', (user_id, list(urls)))
+            else:
+                for start in range(0, len(urls), SQLITE_MAX_IN_LIST):
+                    chunk = urls[start:start + SQLITE_MAX_IN_LIST]
+                    cursor.execute(
+                        f'DELETE FROM favorites WHERE user_id = ? AND url IN ({", ".join("?" * len(chunk))})',
+                        (user_id, *chunk)
+                    )
             
             conn.commit()
             return True
@@ -187,21 +507,36 @@ class Database:
             if conn:
                 self.release_connection(conn)
     
-    def is_favorite(self, url: str) -> bool:
-        """Check if an article is already in favorites."""
+    def is_favorite(self, url: str, user_id: str = DEFAULT_USER) -> bool:
+        """Check if an article is already in a user's favorites."""
+        return url in self.favorite_urls([url], user_id)
+    
+    def favorite_urls(self, urls: List[str], user_id: str = DEFAULT_USER) -> Set[str]:
+        """The subset of `urls` the user has saved, answered with one IN / ANY query."""
+        if not urls:
+            return set()
         conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            placeholder = "%s" if self.is_postgres else "?"
-            cursor.execute(f'SELECT COUNT(*) FROM favorites WHERE url = {placeholder}', (url,))
-            count = cursor.fetchone()[0]
+            saved = set()
+            if self.is_postgres:
+                cursor.execute('SELECT url FROM favorites WHERE user_id = %s AND url = ANY(%s)', (user_id, list(urls)))
+                saved.update(row[0] for row in cursor.fetchall())
+            else:
+                for start in range(0, len(urls), SQLITE_MAX_IN_LIST):
+                    chunk = urls[start:start + SQLITE_MAX_IN_LIST]
+                    cursor.execute(
+                        f'SELECT url FROM favorites WHERE user_id = ? AND url IN ({", ".join("?" * len(chunk))})',
+                        (user_id, *chunk)
+                    )
+                    saved.update(row[0] for row in cursor.fetchall())
             
-            return count > 0
+            return saved
         except Exception as e:
-            print(f"Error checking favorite: {e}")
-            return False
+            print(f"Error checking favorites: {e}")
+            return set()
         finally:
             if conn:
-                self.release_connection(conn)
\ No newline at end of file
+                self.release_connection(conn)
@@ -1,9 +1,16 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Header, Depends, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 import os
+import re
+import json
 import httpx
+import time
+import asyncio
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from pathlib import Path
@@ -13,11 +20,40 @@ ENV_PATH = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=ENV_PATH, override=True)
 
 # Import our modules
-from database.db import Database
+from database.async_db import AsyncDatabase
+from database.db import decode_cursor, DEFAULT_USER
 from ml_models.summarizer import summarizer
 from ml_models.sentiment import sentiment_analyzer
 from ml_models.recommend import recommender
 from services.ai_service import ai_service
+from services.inference_queue import summarize_queue, sentiment_queue
+from services.model_executor import model_executor, limiters
+from ml_models.result_cache import result_cache
+from services.warmup import model_warmup
+from services.enrichment import enrichment_worker
+from services.prompts import PROMPT_VERSION
+from services.ai_scheduler import INTERACTIVE, BACKGROUND
+from services.local_intelligence import local_intelligence
+from services.favorites_cache import favorites_cache
+
+STARTED_AT = time.time()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background model preloading and ingestion enrichment when enabled."""
+    await db.connect()
+    # Analyses from older prompt/schema versions can never be served again
+    removed = await db.purge_intelligence(PROMPT_VERSION)
+    if removed:
+        print(f"🧹 Purged {removed} stored intelligence analyses from older prompt versions")
+    if model_warmup.enabled:
+        model_warmup.start()
+    if enrichment_worker.enabled:
+        enrichment_worker.start()
+    yield
+    await ai_service.aclose()
+    await favorites_cache.close()
+    await db.close()
 
 # Initialize FastAPI app
 root_path = "/api" if os.getenv("VERCEL") else ""
@@ -25,7 +61,8 @@ app = FastAPI(
     title="NewsHub API",
     description="A real-time news aggregator with AI-powered analysis",
     version="1.0.0",
-    root_path=root_path
+    root_path=root_path,
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend integration
@@ -43,8 +80,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database
-db = Database()
+# Initialize database (connects in lifespan, or lazily on first query)
+db = AsyncDatabase()
+ai_service.attach_store(db)
+favorites_cache.attach_store(db)
 
 # NewsAPI configuration
 NEWSAPI_KEY = os.getenv('NEWSAPI_KEY')
@@ -75,6 +114,8 @@ class SummarizeRequest(BaseModel):
     text: str
     max_length: Optional[int] = 150
     min_length: Optional[int] = 30
+    # fast: extractive (instant, for list views), abstractive: BART, auto: BART only when warm and not saturated
+    mode: Literal["fast", "abstractive", "auto"] = "abstractive"
 
 class SentimentRequest(BaseModel):
     text: str
@@ -86,10 +127,64 @@ class RecommendRequest(BaseModel):
 class FavoriteRequest(BaseModel):
     article: Article
 
+class FavoritesBulkRequest(BaseModel):
+    articles: List[Article]
+
+class FavoriteUrlsRequest(BaseModel):
+    urls: List[str]
+
 class IntelligenceRequest(BaseModel):
     title: str
     description: str
     content: str
+    # Article URL; when given, analyses are persisted and shared across viewers
+    url: Optional[str] = None
+
+class IntelligenceBatchRequest(BaseModel):
+    articles: List[IntelligenceRequest]
+    # Prefetch runs at background priority: it yields provider capacity to interactive requests
+    prefetch: bool = False
+
+class EnrichArticle(BaseModel):
+    url: str
+    title: Optional[str] = ""
+    description: Optional[str] = ""
+    content: Optional[str] = ""
+
+class EnrichRequest(BaseModel):
+    articles: List[EnrichArticle]
+    analyses: List[Literal["summary", "sentiment"]] = ["summary", "sentiment"]
+    summary_mode: Literal["fast", "abstractive", "auto"] = "abstractive"
+    max_length: Optional[int] = 150
+    min_length: Optional[int] = 30
+
+# Upper bound on articles per /news/enrich call
+ENRICH_MAX_ARTICLES = int(os.getenv("ENRICH_MAX_ARTICLES", "50"))
+
+# Upper bound on articles per /news/intelligence/batch call or batch job
+INTELLIGENCE_BATCH_MAX_ARTICLES = int(os.getenv("INTELLIGENCE_BATCH_MAX_ARTICLES", "50"))
+
+# Default and maximum page size for GET /user/favorites
+FAVORITES_PAGE_SIZE = int(os.getenv("FAVORITES_PAGE_SIZE", "50"))
+FAVORITES_MAX_PAGE_SIZE = int(os.getenv("FAVORITES_MAX_PAGE_SIZE", "200"))
+
+# Upper bound on articles / URLs per bulk favorites call or membership check
+FAVORITES_BULK_MAX_ITEMS = int(os.getenv("FAVORITES_BULK_MAX_ITEMS", "200"))
+
+USER_ID_PATTERN = re.compile(r"^[A-Za-z0-9._@:-]{1,128}$")
+
+def current_user(
+    x_user_id: Optional[str] = Header(None, description="Favorites owner"),
+    user_id: Optional[str] = Query(None, description="Favorites owner, for clients that cannot set X-User-Id")
+) -> str:
+    """
+    Favorites owner for this request: the X-User-Id header, else the user_id query parameter, else "default".
+    This only separates lists; it is not authentication.
+    """
+    resolved = x_user_id or user_id or DEFAULT_USER
+    if not USER_ID_PATTERN.match(resolved):
+        raise HTTPException(status_code=400, detail="Invalid user id")
+    return resolved
 
 # Helper functions
 def normalize_article(article: Dict[str, Any]) -> Dict[str, Any]:
@@ -329,13 +424,17 @@ async def root():
             "trending": "/news/trending",
             "summarize": "/news/summarize",
             "sentiment": "/news/sentiment",
+            "enrich": "/news/enrich",
             "recommend": "/news/recommend",
-            "favorites": "/user/favorites"
+            "favorites": "/user/favorites",
+            "metrics": "/metrics",
+            "health": "/health/ready"
         }
     }
 
 @app.get("/news")
 async def get_news(
+    background_tasks: BackgroundTasks,
     country: str = Query("us", description="Country code (e.g., us, in, gb)"),
     category: str = Query("general", description="News category"),
     q: Optional[str] = Query(None, description="Keyword search")
@@ -353,8 +452,13 @@ async def get_news(
     try:
         articles = await fetch_news_from_api(country, category, q)
         
-        # Fit recommendation system with new articles
-        recommender.fit(articles)
+        # Fit recommendation system with new articles after the response is sent (on the threadpool),
+        # so /news never waits for sklearn to import or fit
+        background_tasks.add_task(recommender.fit, articles)
+        
+        # Queue new articles for background enrichment and inline whatever is already done
+        enrichment_worker.submit(articles)
+        enrichment_worker.attach(articles)
         
         return {
             "status": "success",
@@ -380,6 +484,8 @@ async def get_trending_news(country: str = Query("us", description="Country code
     """
     try:
         articles = await fetch_trending_news(country)
+        enrichment_worker.submit(articles)
+        enrichment_worker.attach(articles)
         
         return {
             "status": "success",
@@ -396,24 +502,40 @@ async def get_trending_news(country: str = Query("us", description="Country code
 @app.post("/news/summarize")
 async def summarize_article(request: SummarizeRequest):
     """
-    Summarize article text using BART model.
+    Summarize article text using BART model (mode=abstractive) or the fast
+    extractive tier (mode=fast). mode=auto uses BART only when it is already
+    loaded and has spare capacity.
     """
     try:
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
         
-        summary = summarizer.summarize(
-            request.text,
-            max_length=request.max_length,
-            min_length=request.min_length
-        )
+        mode = request.mode
+        if mode == "auto":
+            mode = "abstractive" if summarizer.is_loaded() and limiters["summarize"].has_capacity() else "fast"
+        
+        if mode == "fast":
+            summary = summarizer.summarize_fast(request.text, request.max_length)
+        else:
+            # Repeated texts are answered from the result cache without touching the model queue
+            summary = summarizer.cached_summary(request.text, request.max_length, request.min_length)
+            if summary is None:
+                # Concurrent requests are batched into a single forward pass
+                async with limiters["summarize"].slot():
+                    summary = await summarize_queue.submit(
+                        request.text,
+                        key=(request.max_length, request.min_length)
+                    )
         
         return {
             "status": "success",
+            "mode": mode,
             "original_length": len(request.text),
             "summary_length": len(summary),
             "summary": summary
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error summarizing text: {str(e)}")
 
@@ -426,74 +548,294 @@ async def analyze_sentiment(request: SentimentRequest):
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
         
-        sentiment_result = sentiment_analyzer.analyze_sentiment(request.text)
+        sentiment_result = sentiment_analyzer.cached_sentiment(request.text)
+        if sentiment_result is None:
+            async with limiters["sentiment"].slot():
+                sentiment_result = await sentiment_queue.submit(request.text)
         
         return {
             "status": "success",
             "sentiment": sentiment_result
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing sentiment: {str(e)}")
 
+@app.post("/news/enrich")
+async def enrich_articles(request: EnrichRequest):
+    """
+    Summarize and/or analyze sentiment for a whole page of articles in one call.
+    
+    Identical texts are deduplicated and each model runs once over the batch,
+    so a page costs one request and one batched forward pass per model.
+    Results are keyed by article URL.
+    """
+    try:
+        if not request.articles:
+            raise HTTPException(status_code=400, detail="No articles provided")
+        if len(request.articles) > ENRICH_MAX_ARTICLES:
+            raise HTTPException(status_code=400, detail=f"Too many articles (max {ENRICH_MAX_ARTICLES})")
+        
+        # Prefer the fullest text available for each article
+        texts = {
+            article.url: (article.content or article.description or article.title or "")
+            for article in request.articles
+        }
+        unique_texts = list(dict.fromkeys(texts.values()))
+        
+        summary_mode = request.summary_mode
+        if summary_mode == "auto":
+            summary_mode = "abstractive" if summarizer.is_loaded() and limiters["summarize"].has_capacity() else "fast"
+        
+        async def run_summaries() -> Dict[str, str]:
+            if summary_mode == "fast":
+                summaries = await run_in_threadpool(
+                    lambda: [summarizer.summarize_fast(text, request.max_length) for text in unique_texts]
+                )
+            else:
+                async with limiters["summarize"].slot():
+                    summaries = await model_executor.run(
+                        summarizer.summarize_batch, unique_texts,
+                        max_length=request.max_length, min_length=request.min_length
+                    )
+            return dict(zip(unique_texts, summaries))
+        
+        async def run_sentiments() -> Dict[str, dict]:
+            async with limiters["sentiment"].slot():
+                sentiments = await model_executor.run(sentiment_analyzer.analyze_batch, unique_texts)
+            return dict(zip(unique_texts, sentiments))
+        
+        jobs = {}
+        if "summary" in request.analyses:
+            jobs["summary"] = run_summaries()
+        if "sentiment" in request.analyses:
+            jobs["sentiment"] = run_sentiments()
+        outputs = dict(zip(jobs.keys(), await asyncio.gather(*jobs.values())))
+        
+        results = {
+            url: {analysis: outputs[analysis][text] for analysis in outputs}
+            for url, text in texts.items()
+        }
+        return {
+            "status": "success",
+            "summary_mode": summary_mode if "summary" in outputs else None,
+            "count": len(results),
+            "unique_texts": len(unique_texts),
+            "results": results
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error enriching articles: {str(e)}")
+
 @app.post("/news/intelligence")
 async def analyze_news_intelligence(request: IntelligenceRequest):
     """
     Generate complete multi-dimensional AI intelligence for an article.
     """
     try:
-        analysis = await ai_service.analyze_article(
-            title=request.title,
-            description=request.description,
-            content=request.content
-        )
+        async with limiters["intelligence"].slot():
+            analysis = await ai_service.analyze_article(
+                title=request.title,
+                description=request.description,
+                content=request.content,
+                url=request.url
+            )
         return {
             "status": "success",
             "intelligence": analysis
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating intelligence analysis: {str(e)}")
 
+@app.post("/news/intelligence/batch")
+async def analyze_news_intelligence_batch(request: IntelligenceBatchRequest):
+    """
+    Generate AI intelligence for several articles at once.
+    
+    Articles are packed into shared LLM requests under a token budget, so the
+    prompt overhead is paid per batch rather than per article. Results are
+    returned in request order.
+    """
+    try:
+        if not request.articles:
+            raise HTTPException(status_code=400, detail="No articles provided")
+        if len(request.articles) > INTELLIGENCE_BATCH_MAX_ARTICLES:
+            raise HTTPException(status_code=400, detail=f"Too many articles (max {INTELLIGENCE_BATCH_MAX_ARTICLES})")
+        
+        async with limiters["intelligence"].slot():
+            analyses = await ai_service.analyze_articles(
+                [article.dict() for article in request.articles],
+                priority=BACKGROUND if request.prefetch else INTERACTIVE
+            )
+        return {
+            "status": "success",
+            "count": len(analyses),
+            "intelligence": analyses
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating intelligence analysis: {str(e)}")
+
+@app.post("/news/intelligence/batch/jobs")
+async def submit_intelligence_batch_job(request: IntelligenceBatchRequest):
+    """
+    Queue background pre-analysis on the provider's asynchronous batch API (OpenAI or Claude).
+    Jobs are tracked per process: poll from the same worker that submitted the job.
+    """
+    try:
+        if not request.articles:
+            raise HTTPException(status_code=400, detail="No articles provided")
+        if len(request.articles) > INTELLIGENCE_BATCH_MAX_ARTICLES:
+            raise HTTPException(status_code=400, detail=f"Too many articles (max {INTELLIGENCE_BATCH_MAX_ARTICLES})")
+        
+        job = await ai_service.submit_batch_job([article.dict() for article in request.articles])
+        return {"status": "success", **job}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error submitting batch job: {str(e)}")
+
+@app.get("/news/intelligence/batch/jobs/{job_id}")
+async def get_intelligence_batch_job(job_id: str):
+    """
+    Poll a batch job; returns the analyses once the provider has finished.
+    Articles a failed, expired or cancelled job did not answer are analyzed individually.
+    404 if the job was submitted to another worker (or before a restart).
+    """
+    try:
+        return {"status": "success", **await ai_service.collect_batch_job(job_id)}
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error collecting batch job: {str(e)}")
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/news/intelligence/stream")
+async def stream_news_intelligence(request: IntelligenceRequest):
+    """
+    Stream AI intelligence for an article as Server-Sent Events.
+    
+    Each top-level section (summary, sentiment, political_analysis, ...) is
+    sent as a `section` event as soon as the provider has finished generating
+    it, followed by a final `done` event (or `error` if streaming fails).
+    """
+    limiter = limiters["intelligence"]
+    # Reject before the 200 response starts; the slot itself is held while streaming
+    limiter.check_admission()
+
+    async def events():
+        started = time.perf_counter()
+        sections = 0
+        try:
+            async with limiter.slot():
+                async for section, data in ai_service.stream_article(
+                    title=request.title,
+                    description=request.description,
+                    content=request.content,
+                    url=request.url
+                ):
+                    sections += 1
+                    yield sse_event("section", {"section": section, "data": data})
+            yield sse_event("done", {
+                "status": "success",
+                "provider": ai_service.provider,
+                "sections": sections,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+            })
+        except Exception as e:
+            yield sse_event("error", {"detail": f"Error generating intelligence analysis: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/news/recommend")
 async def recommend_articles(request: RecommendRequest):
     """
     Get article recommendations based on similarity.
     """
     try:
-        recommendations = recommender.recommend_similar(
-            request.article.dict(),
-            n_recommendations=request.n_recommendations
-        )
+        async with limiters["recommend"].slot():
+            recommendations = await model_executor.run(
+                recommender.recommend_similar,
+                request.article.dict(),
+                n_recommendations=request.n_recommendations
+            )
         
         return {
             "status": "success",
             "recommendations": recommendations,
             "count": len(recommendations)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting recommendations: {str(e)}")
 
 @app.get("/user/favorites")
-async def get_favorites():
+async def get_favorites(
+    limit: int = Query(FAVORITES_PAGE_SIZE, ge=1, le=FAVORITES_MAX_PAGE_SIZE, description="Page size"),
+    before: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    user: str = Depends(current_user),
+    if_none_match: Optional[str] = Header(None)
+):
     """
-    Get user's favorite articles.
+    Get user's favorite articles, newest first, one page at a time.
+    Pages are served from the favorites cache and carry an ETag; a matching If-None-Match gets 304.
     """
     try:
-        favorites = db.get_favorites()
-        return {
-            "status": "success",
-            "favorites": favorites,
-            "count": len(favorites)
-        }
+        try:
+            position = decode_cursor(before) if before else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        page = f"{limit}:{before or ''}"
+        version = await favorites_cache.version(user)
+        headers = {"Cache-Control": "private, no-cache", "Vary": "X-User-Id"}
+        if version is not None:
+            headers["ETag"] = favorites_cache.etag(user, version, page)
+            if favorites_cache.matches(if_none_match, headers["ETag"]):
+                favorites_cache.not_modified += 1
+                return Response(status_code=304, headers=headers)
+
+        async def load_page():
+            (favorites, next_cursor), total = await asyncio.gather(
+                db.get_favorites_page(limit, position, user),
+                favorites_cache.count(user, version, lambda: db.count_favorites(user))
+            )
+            return {
+                "favorites": favorites,
+                "count": len(favorites),
+                "total": total,
+                "next_cursor": next_cursor
+            }
+
+        payload = await favorites_cache.page(user, version, page, load_page)
+        return JSONResponse(content={"status": "success", **payload}, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching favorites: {str(e)}")
 
 @app.post("/user/favorites")
-async def add_favorite(request: FavoriteRequest):
+async def add_favorite(request: FavoriteRequest, user: str = Depends(current_user)):
     """
     Add an article to favorites.
     """
     try:
-        success = db.add_favorite(request.article.dict())
+        success = await favorites_cache.add([request.article.dict()], user)
         if success:
             return {
                 "status": "success",
@@ -505,12 +847,12 @@ async def add_favorite(request: FavoriteRequest):
         raise HTTPException(status_code=500, detail=f"Error adding favorite: {str(e)}")
 
 @app.delete("/user/favorites")
-async def remove_favorite(url: str):
+async def remove_favorite(url: str, user: str = Depends(current_user)):
     """
     Remove an article from favorites.
     """
     try:
-        success = db.remove_favorite(url)
+        success = await favorites_cache.remove([url], user)
         if success:
             return {
                 "status": "success",
@@ -521,6 +863,121 @@ async def remove_favorite(url: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error removing favorite: {str(e)}")
 
+@app.post("/user/favorites/bulk")
+async def add_favorites_bulk(request: FavoritesBulkRequest, user: str = Depends(current_user)):
+    """
+    Add many articles to favorites in one batched write (already-saved URLs are skipped).
+    """
+    try:
+        if len(request.articles) > FAVORITES_BULK_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"Too many articles (max {FAVORITES_BULK_MAX_ITEMS})")
+        
+        if not await favorites_cache.add([article.dict() for article in request.articles], user):
+            raise HTTPException(status_code=500, detail="Failed to add articles to favorites")
+        return {
+            "status": "success",
+            "message": "Articles added to favorites",
+            "count": len(request.articles)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error adding favorites: {str(e)}")
+
+@app.post("/user/favorites/bulk-delete")
+async def remove_favorites_bulk(request: FavoriteUrlsRequest, user: str = Depends(current_user)):
+    """
+    Remove many articles from favorites with one statement.
+    """
+    try:
+        if len(request.urls) > FAVORITES_BULK_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"Too many URLs (max {FAVORITES_BULK_MAX_ITEMS})")
+        
+        if not await favorites_cache.remove(request.urls, user):
+            raise HTTPException(status_code=500, detail="Failed to remove articles from favorites")
+        return {
+            "status": "success",
+            "message": "Articles removed from favorites",
+            "count": len(request.urls)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error removing favorites: {str(e)}")
+
+@app.post("/user/favorites/check")
+async def check_favorites(request: FavoriteUrlsRequest, user: str = Depends(current_user)):
+    """
+    Which of a page of article URLs the user has saved, answered with a single query.
+    """
+    try:
+        if len(request.urls) > FAVORITES_BULK_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"Too many URLs (max {FAVORITES_BULK_MAX_ITEMS})")
+        
+        saved = await db.favorite_urls(request.urls, user)
+        return {
+            "status": "success",
+            "favorites": {url: url in saved for url in request.urls}
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error checking favorites: {str(e)}")
+
+@app.get("/health/live")
+async def health_live():
+    """
+    Liveness probe: the process is up and the event loop is responsive.
+    """
+    return {
+        "status": "alive",
+        "uptime_seconds": round(time.time() - STARTED_AT, 1)
+    }
+
+@app.get("/health/ready")
+async def health_ready():
+    """
+    Readiness probe: the database answers and (with PRELOAD_MODELS) models are warmed.
+    Returns 503 until the process can serve traffic at steady-state latency.
+    """
+    database_ok = await db.ping()
+    ready = database_ok and model_warmup.ready
+    payload = {
+        "status": "ready" if ready else "not_ready",
+        "database": {
+            "ok": database_ok,
+            "backend": "postgres" if db.is_postgres else "sqlite"
+        },
+        "models": model_warmup.status(),
+        "uptime_seconds": round(time.time() - STARTED_AT, 1)
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=payload)
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Report model pool, admission queue, batching and AI provider routing counters.
+    """
+    return {
+        "status": "success",
+        "model_executor": model_executor.stats(),
+        "endpoints": {name: limiter.stats() for name, limiter in limiters.items()},
+        "batching": {
+            "summarize": summarize_queue.stats(),
+            "sentiment": sentiment_queue.stats()
+        },
+        "result_cache": result_cache.stats(),
+        "enrichment": enrichment_worker.stats(),
+        "ai_providers": ai_service.router.stats(),
+        "ai_scheduler": ai_service.router.scheduler.stats() if ai_service.router.scheduler else None,
+        "ai_batching": ai_service.batch_stats,
+        "ai_prompts": ai_service.prompt_usage.stats(),
+        "ai_result_store": {"prompt_version": PROMPT_VERSION, **ai_service.store_stats},
+        "ai_local_fallback": local_intelligence.stats(),
+        "database": db.stats(),
+        "favorites_cache": favorites_cache.stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
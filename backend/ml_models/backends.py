@@ -0,0 +1,86 @@
+import os
+import re
+from pathlib import Path
+
+# Selectable CPU inference backends for the local pipelines:
+#   pytorch   - full-precision transformers pipeline (default)
+#   quantized - PyTorch dynamic int8 quantization of every nn.Linear layer
+#   onnx      - ONNX Runtime graph exported via optimum (pip install "optimum[onnxruntime]")
+SUPPORTED_BACKENDS = ("pytorch", "quantized", "onnx")
+
+ONNX_MODEL_DIR = Path(os.getenv("ONNX_MODEL_DIR", Path(__file__).parent / "onnx_models"))
+
+
+def get_backend() -> str:
+    """Return the configured INFERENCE_BACKEND, defaulting to pytorch."""
+    backend = os.getenv("INFERENCE_BACKEND", "pytorch").lower()
+    if backend not in SUPPORTED_BACKENDS:
+        print(f"⚠️ Unknown INFERENCE_BACKEND '{backend}', using pytorch")
+        return "pytorch"
+    return backend
+
+
+def build_pipeline(task: str, model_name: str, backend: str = "pytorch"):
+    """
+    Build a transformers pipeline for `task` on the requested backend.
+
+    Every backend returns a regular `transformers.pipeline`, so callers keep
+    the same input/output contract regardless of how inference runs.
+
+    Args:
+        task: "summarization" or "sentiment-analysis"
+        model_name: Hugging Face model id or local path
+        backend: One of SUPPORTED_BACKENDS
+
+    Returns:
+        A ready-to-call pipeline
+    """
+    from transformers import pipeline, AutoTokenizer
+    import torch
+
+    if backend == "pytorch":
+        return pipeline(task, model=model_name, device=0 if torch.cuda.is_available() else -1)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    if backend == "quantized":
+        from transformers import AutoModelForSeq2SeqLM, AutoModelForSequenceClassification
+
+        model_cls = AutoModelForSeq2SeqLM if task == "summarization" else AutoModelForSequenceClassification
+        model = model_cls.from_pretrained(model_name)
+        model.eval()
+        # Dynamic quantization only targets CPU kernels
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline(task, model=model, tokenizer=tokenizer, device=-1)
+
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+
+        model_cls = ORTModelForSeq2SeqLM if task == "summarization" else ORTModelForSequenceClassification
+        export_dir = ONNX_MODEL_DIR / re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+        if export_dir.exists():
+            model = model_cls.from_pretrained(export_dir)
+        else:
+            # First run exports the graph; later loads reuse the saved copy
+            print(f"📦 Exporting {model_name} to ONNX at {export_dir}...")
+            model = model_cls.from_pretrained(model_name, export=True)
+            model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+        return pipeline(task, model=model, tokenizer=tokenizer)
+
+    raise ValueError(f"Unsupported inference backend: {backend}")
+
+
+def load_pipeline(task: str, model_name: str, backend: str):
+    """
+    Build a pipeline on `backend`, falling back to plain PyTorch if that backend can't load.
+
+    Returns:
+        Tuple of (pipeline, backend actually used)
+    """
+    if backend != "pytorch":
+        try:
+            return build_pipeline(task, model_name, backend), backend
+        except Exception as e:
+            print(f"⚠️ {backend} backend unavailable for {model_name}: {e}. Using pytorch...")
+    return build_pipeline(task, model_name, "pytorch"), "pytorch"
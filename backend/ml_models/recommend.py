@@ -1,16 +1,12 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
 from typing import List, Dict
 
+# sklearn and numpy are imported on first fit/query: together they are most of the API's cold-start import time
+
 class NewsRecommender:
     def __init__(self):
         """Initialize the recommendation system."""
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+        # Built by fit(); each fit swaps in a new vectorizer so concurrent queries never see a half-fitted one
+        self.vectorizer = None
         self.articles = []
         self.article_vectors = None
         self.is_fitted = False
@@ -22,8 +18,6 @@ class NewsRecommender:
         Args:
             articles: List of article dictionaries with 'title', 'description', and 'content'
         """
-        self.articles = articles
-        
         # Combine title, description, and content for better representation
         texts = []
         cleaned_articles = []
@@ -51,9 +45,15 @@ class NewsRecommender:
             return
 
         # Fit TF-IDF vectorizer with safeguards
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer(
+            max_features=1000,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
         try:
-            self.article_vectors = self.vectorizer.fit_transform(texts)
-            self.articles = cleaned_articles
+            article_vectors = vectorizer.fit_transform(texts)
+            self.vectorizer, self.article_vectors, self.articles = vectorizer, article_vectors, cleaned_articles
             self.is_fitted = True
             print(f"✅ Recommendation system fitted with {len(cleaned_articles)} articles")
         except ValueError as e:
@@ -89,17 +89,21 @@ class NewsRecommender:
         target_text = ' '.join(text_parts)
         
         # If not enough training data, bail out gracefully
-        if not self.is_fitted or self.article_vectors is None:
+        vectorizer, article_vectors, articles = self.vectorizer, self.article_vectors, self.articles
+        if not self.is_fitted or article_vectors is None:
             return []
 
+        from sklearn.metrics.pairwise import cosine_similarity
+        import numpy as np
+
         # Vectorize target article
         try:
-            target_vector = self.vectorizer.transform([target_text])
+            target_vector = vectorizer.transform([target_text])
         except ValueError:
             return []
         
         # Calculate cosine similarities
-        similarities = cosine_similarity(target_vector, self.article_vectors).flatten()
+        similarities = cosine_similarity(target_vector, article_vectors).flatten()
         
         # Get indices of most similar articles (excluding the target article itself)
         similar_indices = np.argsort(similarities)[::-1]
@@ -111,10 +115,10 @@ class NewsRecommender:
                 break
             
             # Check if this is not the same article
-            if self._is_same_article(target_article, self.articles[idx]):
+            if self._is_same_article(target_article, articles[idx]):
                 continue
             
-            article_with_score = self.articles[idx].copy()
+            article_with_score = articles[idx].copy()
             article_with_score['similarity_score'] = round(similarities[idx], 3)
             recommendations.append(article_with_score)
         
@@ -140,14 +144,17 @@ class NewsRecommender:
         Returns:
             List of trending topic terms
         """
-        if not self.is_fitted or self.article_vectors is None:
+        vectorizer, article_vectors = self.vectorizer, self.article_vectors
+        if not self.is_fitted or article_vectors is None:
             return []
         
+        import numpy as np
+
         # Get feature names (terms)
-        feature_names = self.vectorizer.get_feature_names_out()
+        feature_names = vectorizer.get_feature_names_out()
         
         # Calculate mean TF-IDF scores across all articles
-        mean_scores = np.mean(self.article_vectors.toarray(), axis=0)
+        mean_scores = np.mean(article_vectors.toarray(), axis=0)
         
         # Get top terms
         top_indices = np.argsort(mean_scores)[::-1][:n_topics]
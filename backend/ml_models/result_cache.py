@@ -0,0 +1,197 @@
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Relative cache paths resolve here rather than against the working directory
+DATA_DIR = os.getenv("DATA_DIR", str(Path(__file__).resolve().parent.parent))
+
+
+class ResultCache:
+    """
+    Content-addressed cache for model outputs.
+
+    Keys are a SHA-256 of the normalized input text plus the model name and
+    generation parameters, so the same article text always maps to the same
+    entry no matter which card or endpoint asked for it. Lookups go through
+    an in-memory LRU bounded by total payload size, then a persistent SQLite
+    tier that survives restarts. Safe to use from the model worker threads.
+
+    The SQLite file is opened on first disk access, not at import. If it
+    cannot be opened (e.g. a read-only deploy filesystem) the failure is
+    logged once and the cache stays memory-only.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, db_path: Optional[str] = "result_cache.db", max_disk_rows: int = 100000):
+        self.max_bytes = max_bytes
+        self.max_disk_rows = max_disk_rows
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.db_path = str(Path(DATA_DIR) / db_path) if db_path else None
+        self._conn = None
+        self._disk_opened = False
+        self._writes_since_prune = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """The SQLite connection, opened on first use; None when the disk tier is off or failed (caller holds the lock)."""
+        if not self._disk_opened:
+            self._disk_opened = True
+            if self.db_path:
+                try:
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute('''
+                        CREATE TABLE IF NOT EXISTS results (
+                            key TEXT PRIMARY KEY,
+                            value TEXT NOT NULL,
+                            created_at REAL NOT NULL
+                        )
+                    ''')
+                    conn.commit()
+                    self._conn = conn
+                except Exception as e:
+                    print(f"⚠️ Result cache disk tier disabled ({self.db_path}): {e}")
+        return self._conn
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different copies of an article share a key."""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def make_key(self, text: str, model: str, **params) -> str:
+        """Build the content-addressed key for a text/model/parameters combination."""
+        digest = hashlib.sha256()
+        digest.update(self.normalize(text).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_memory(self, key: str) -> Optional[Any]:
+        """Memory-only lookup, cheap enough to run on the event loop."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Look up several keys, falling through to disk and promoting disk hits."""
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._memory.get(key)
+                if entry is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[0]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+
+        if missing and self.db_path:
+            placeholders = ",".join("?" * len(missing))
+            try:
+                with self._lock:
+                    conn = self._disk()
+                    rows = conn.execute(
+                        f"SELECT key, value FROM results WHERE key IN ({placeholders})", missing
+                    ).fetchall() if conn is not None else []
+            except Exception as e:
+                print(f"⚠️ Result cache disk read failed: {e}")
+                rows = []
+            for key, value in rows:
+                found[key] = json.loads(value)
+                self._remember(key, found[key], len(value))
+                self.disk_hits += 1
+
+        self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    def set_many(self, items: Dict[str, Any]):
+        """Store results in both tiers."""
+        if not items:
+            return
+        rows = []
+        now = time.time()
+        for key, value in items.items():
+            payload = json.dumps(value)
+            self._remember(key, value, len(payload))
+            rows.append((key, payload, now))
+
+        if self.db_path:
+            try:
+                with self._lock:
+                    conn = self._disk()
+                    if conn is None:
+                        return
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO results (key, value, created_at) VALUES (?, ?, ?)", rows
+                    )
+                    conn.commit()
+                    self._writes_since_prune += len(rows)
+                    if self._writes_since_prune >= 1000:
+                        self._prune_disk()
+            except Exception as e:
+                print(f"⚠️ Result cache disk write failed: {e}")
+
+    def _remember(self, key: str, value: Any, size: int):
+        """Insert into the memory LRU and evict least-recently-used entries over the byte budget."""
+        size += len(key)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            self._memory[key] = (value, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    def _prune_disk(self):
+        """Drop the oldest disk rows beyond max_disk_rows (caller holds the lock)."""
+        self._writes_since_prune = 0
+        self._conn.execute('''
+            DELETE FROM results WHERE key IN (
+                SELECT key FROM results ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_disk_rows,))
+        self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring."""
+        return {
+            "entries": len(self._memory),
+            "bytes": self._memory_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "disk_path": self.db_path,
+            # Not yet known until the first disk access opens the file
+            "disk_enabled": self._conn is not None if self._disk_opened else bool(self.db_path)
+        }
+
+
+# Global instance (set RESULT_CACHE_PATH to an empty string for a memory-only cache; relative paths resolve against DATA_DIR)
+result_cache = ResultCache(
+    max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    db_path=os.getenv("RESULT_CACHE_PATH", "result_cache.db"),
+    max_disk_rows=int(os.getenv("RESULT_CACHE_MAX_DISK_ROWS", "100000"))
+)
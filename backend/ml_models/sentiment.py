@@ -1,40 +1,93 @@
+import threading
+import time
+from typing import List, Optional
+
+from ml_models.result_cache import result_cache
+from ml_models.backends import get_backend, load_pipeline
+from ml_models.lexicon import lexicon_sentiment
+
 class SentimentAnalyzer:
     def __init__(self):
         """Initialize the sentiment analysis model placeholder."""
+        self.model_name = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+        self.backend = get_backend()
+        # Cache keys use the configured model and backend, fixed here: load-time fallbacks change
+        # self.model_name / self.backend, and lookups made before the load must hit the same entries
+        self.cache_model = self.model_name
+        self.cache_backend = self.backend
         self.sentiment_pipeline = None
         self.tried_loading = False
+        self._load_lock = threading.Lock()
+        self.warmed = False
+        self.load_seconds = None
+        self.warmup_seconds = None
     
     def _load_model(self):
-        """Load the sentiment analysis model lazily."""
+        """Load the sentiment analysis model lazily (concurrent callers wait for the first load)."""
         if self.tried_loading:
             return
-        self.tried_loading = True
-        try:
-            print("🔄 Lazy-loading sentiment analysis model...")
-            from transformers import pipeline
-            import torch
-            
-            self.sentiment_pipeline = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                device=0 if torch.cuda.is_available() else -1
-            )
-            print("✅ Sentiment analysis model loaded successfully")
-        except Exception as e:
-            print(f"❌ Error loading sentiment model: {e}. Trying fallback pipeline...")
-            # Fallback to a simpler model
+        with self._load_lock:
+            if self.tried_loading:
+                return
+            started = time.perf_counter()
             try:
-                from transformers import pipeline
-                import torch
-                
-                self.sentiment_pipeline = pipeline(
-                    "sentiment-analysis",
-                    device=0 if torch.cuda.is_available() else -1
-                )
-                print("✅ Fallback sentiment model loaded")
-            except Exception as e2:
-                print(f"❌ Error loading fallback sentiment model: {e2}")
-                self.sentiment_pipeline = None
+                print(f"🔄 Lazy-loading sentiment analysis model ({self.backend} backend)...")
+                self.sentiment_pipeline, self.backend = load_pipeline("sentiment-analysis", self.model_name, self.backend)
+                print(f"✅ Sentiment analysis model loaded successfully ({self.backend} backend)")
+            except Exception as e:
+                print(f"❌ Error loading sentiment model: {e}. Trying fallback pipeline...")
+                # Fallback to a simpler model
+                try:
+                    from transformers import pipeline
+                    import torch
+                    
+                    self.sentiment_pipeline = pipeline(
+                        "sentiment-analysis",
+                        device=0 if torch.cuda.is_available() else -1
+                    )
+                    # Report which model actually loaded (cache keys keep the configured one)
+                    self.model_name = self.sentiment_pipeline.model.name_or_path
+                    self.backend = "pytorch"
+                    print("✅ Fallback sentiment model loaded")
+                except Exception as e2:
+                    print(f"❌ Error loading fallback sentiment model: {e2}")
+                    self.sentiment_pipeline = None
+            finally:
+                self.load_seconds = round(time.perf_counter() - started, 3)
+                self.tried_loading = True
+    
+    def warm_up(self) -> bool:
+        """
+        Load the model and run a dummy batch so the first real request
+        doesn't pay model load and first-inference costs.
+        
+        Returns:
+            True if the model is loaded and warmed
+        """
+        self._load_model()
+        if not self.sentiment_pipeline:
+            return False
+        started = time.perf_counter()
+        self.sentiment_pipeline(
+            ["Markets rallied after the announcement.", "The storm caused severe damage across the region."],
+            truncation=True,
+            batch_size=2
+        )
+        self.warmup_seconds = round(time.perf_counter() - started, 3)
+        self.warmed = True
+        return True
+    
+    def status(self) -> dict:
+        """Report load state and timings for health checks."""
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "loaded": self.sentiment_pipeline is not None,
+            "tried_loading": self.tried_loading,
+            "warmed": self.warmed,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds
+        }
     
     def analyze_sentiment(self, text: str) -> dict:
         """
@@ -46,12 +99,44 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with sentiment analysis results
         """
-        if not text or len(text.strip()) < 10:
-            return {
-                "label": "NEUTRAL",
-                "score": 0.5,
-                "confidence": "low"
-            }
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(self, texts: List[str]) -> List[dict]:
+        """
+        Analyze sentiment of several texts with a single padded forward pass.
+        
+        Args:
+            texts: Input texts to analyze
+        
+        Returns:
+            Sentiment results in the same order as the inputs
+        """
+        results: List[Optional[dict]] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 10:
+                results[i] = {
+                    "label": "NEUTRAL",
+                    "score": 0.5,
+                    "confidence": "low"
+                }
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        # Serve previously computed predictions straight from the content-addressed cache
+        keys = {i: self._cache_key(texts[i]) for i in pending}
+        cached = result_cache.get_many(keys.values())
+        for i in pending:
+            if keys[i] in cached:
+                results[i] = cached[keys[i]]
+        
+        # Identical texts in one batch only go through the model once
+        to_run = list({keys[i]: i for i in pending if keys[i] not in cached}.values())
+        if not to_run:
+            return results
         
         try:
             # Trigger lazy load
@@ -59,61 +144,87 @@ class SentimentAnalyzer:
             
             if self.sentiment_pipeline:
                 # Truncate text if too long
-                if len(text) > 512:
-                    text = text[:512]
-                
-                result = self.sentiment_pipeline(text)
+                inputs = [texts[i][:512] for i in to_run]
                 
-                # Handle different model outputs
-                if isinstance(result, list) and len(result) > 0:
-                    sentiment_data = result[0]
-                    label = sentiment_data['label'].upper()
-                    score = sentiment_data['score']
-                    
-                    # Map labels to our standard format
-                    if 'POSITIVE' in label or 'LABEL_2' in label:
-                        label = 'POSITIVE'
-                    elif 'NEGATIVE' in label or 'LABEL_0' in label:
-                        label = 'NEGATIVE'
-                    else:
-                        label = 'NEUTRAL'
-                    
-                    # Determine confidence level
-                    if score > 0.8:
-                        confidence = "high"
-                    elif score > 0.6:
-                        confidence = "medium"
-                    else:
-                        confidence = "low"
-                    
-                    return {
-                        "label": label,
-                        "score": round(score, 3),
-                        "confidence": confidence
-                    }
-                else:
-                    return self._fallback_sentiment(text)
+                outputs = self.sentiment_pipeline(
+                    inputs,
+                    truncation=True,
+                    batch_size=len(inputs)
+                )
+                fresh = {keys[i]: self._format_result(output) for i, output in zip(to_run, outputs) if output}
+                result_cache.set_many(fresh)
+                for i in pending:
+                    if results[i] is None:
+                        results[i] = fresh.get(keys[i]) or self._fallback_sentiment(texts[i])
             else:
-                return self._fallback_sentiment(text)
+                for i in pending:
+                    if results[i] is None:
+                        results[i] = self._fallback_sentiment(texts[i])
         except Exception as e:
             print(f"Error in sentiment analysis: {e}")
-            return self._fallback_sentiment(text)
+            for i in pending:
+                if results[i] is None:
+                    results[i] = self._fallback_sentiment(texts[i])
+        
+        return results
     
-    def _fallback_sentiment(self, text: str) -> dict:
-        """Simple rule-based sentiment analysis as fallback."""
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'positive', 'success', 'win', 'achievement', 'breakthrough', 'innovation', 'growth', 'profit', 'gain']
-        negative_words = ['bad', 'terrible', 'awful', 'horrible', 'negative', 'failure', 'lose', 'problem', 'issue', 'crisis', 'decline', 'loss', 'crash', 'disaster', 'crisis']
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        
-        if positive_count > negative_count:
-            return {"label": "POSITIVE", "score": 0.7, "confidence": "low"}
-        elif negative_count > positive_count:
-            return {"label": "NEGATIVE", "score": 0.7, "confidence": "low"}
+    def _cache_key(self, text: str) -> str:
+        """Content-addressed cache key for the sentiment of `text` (inputs are truncated to 512 chars)."""
+        return result_cache.make_key(text[:512], self.cache_model, backend=self.cache_backend, max_chars=512)
+    
+    def cached_sentiment(self, text: str) -> Optional[dict]:
+        """Return a previously computed prediction from the in-memory cache, if any."""
+        return result_cache.get_memory(self._cache_key(text))
+    
+    def _format_result(self, sentiment_data: dict) -> dict:
+        """Map a raw pipeline prediction to our standard label/score/confidence format."""
+        label = sentiment_data['label'].upper()
+        score = sentiment_data['score']
+        
+        # Map labels to our standard format
+        if 'POSITIVE' in label or 'LABEL_2' in label:
+            label = 'POSITIVE'
+        elif 'NEGATIVE' in label or 'LABEL_0' in label:
+            label = 'NEGATIVE'
+        else:
+            label = 'NEUTRAL'
+        
+        # Determine confidence level
+        if score > 0.8:
+            confidence = "high"
+        elif score > 0.6:
+            confidence = "medium"
         else:
-            return {"label": "NEUTRAL", "score": 0.5, "confidence": "low"}
+            confidence = "low"
+        
+        return {
+            "label": label,
+            "score": round(score, 3),
+            "confidence": confidence
+        }
+    
+    def analyze_fast_batch(self, texts: List[str]) -> List[dict]:
+        """
+        Score many texts with the lexicon engine only (no model load, no forward pass).
+        
+        This is the bulk path for ingestion-time enrichment; the transformer is
+        reserved for on-demand requests that need its precision.
+        
+        Args:
+            texts: Input texts to analyze
+        
+        Returns:
+            Sentiment results in the same order as the inputs
+        """
+        results = lexicon_sentiment.analyze_batch(texts)
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 10:
+                results[i] = {"label": "NEUTRAL", "score": 0.5, "confidence": "low"}
+        return results
+    
+    def _fallback_sentiment(self, text: str) -> dict:
+        """Weighted lexicon sentiment as fallback."""
+        return lexicon_sentiment.analyze(text)
 
 # Global instance (placeholder - model won't load until .analyze_sentiment() is called)
 sentiment_analyzer = SentimentAnalyzer()
\ No newline at end of file
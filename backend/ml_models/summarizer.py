@@ -1,31 +1,86 @@
+import os
+import threading
+import time
+from typing import List, Optional
+
+from ml_models.result_cache import result_cache
+from ml_models.backends import get_backend, load_pipeline
+from ml_models.extractive import extractive_summarizer, SENTENCE_BOUNDARY
+
+SUMMARY_MODES = ("fast", "abstractive", "auto")
+
 class NewsSummarizer:
     def __init__(self):
         """Initialize the summarization model placeholder."""
         self.model_name = "facebook/bart-large-cnn"
+        self.backend = get_backend()
+        # Cache keys use the configured model and backend, fixed here: load-time fallbacks change
+        # self.model_name / self.backend, and lookups made before the load must hit the same entries
+        self.cache_model = self.model_name
+        self.cache_backend = self.backend
         self.summarizer = None
         self.tried_loading = False
+        self._load_lock = threading.Lock()
+        self.warmed = False
+        self.load_seconds = None
+        self.warmup_seconds = None
+        
+        # Long-document mode: articles are split into token-bounded windows that are
+        # summarized in one batched pass, then reduced. The chunk cap is the latency budget
+        # (set SUMMARIZER_MAX_CHUNKS=1 to only summarize the opening window).
+        self.chunk_tokens = int(os.getenv("SUMMARIZER_CHUNK_TOKENS", "512"))
+        self.max_chunks = int(os.getenv("SUMMARIZER_MAX_CHUNKS", "4"))
     
     def _load_model(self):
-        """Load the summarization model lazily."""
+        """Load the summarization model lazily (concurrent callers wait for the first load)."""
         if self.tried_loading:
             return
-        self.tried_loading = True
-        try:
-            print("🔄 Lazy-loading BART summarization model...")
-            from transformers import pipeline
-            import torch
-            
-            self.summarizer = pipeline(
-                "summarization",
-                model=self.model_name,
-                device=0 if torch.cuda.is_available() else -1
-            )
-            print("✅ Summarization model loaded successfully")
-        except Exception as e:
-            print(f"❌ Error loading summarization model: {e}")
-            self.summarizer = None
+        with self._load_lock:
+            if self.tried_loading:
+                return
+            started = time.perf_counter()
+            try:
+                print(f"🔄 Lazy-loading BART summarization model ({self.backend} backend)...")
+                self.summarizer, self.backend = load_pipeline("summarization", self.model_name, self.backend)
+                print(f"✅ Summarization model loaded successfully ({self.backend} backend)")
+            except Exception as e:
+                print(f"❌ Error loading summarization model: {e}")
+                self.summarizer = None
+            finally:
+                self.load_seconds = round(time.perf_counter() - started, 3)
+                self.tried_loading = True
     
-    def summarize(self, text: str, max_length: int = 150, min_length: int = 30) -> str:
+    def warm_up(self) -> bool:
+        """
+        Load the model and run a dummy batch so the first real request
+        doesn't pay model load and first-inference costs.
+        
+        Returns:
+            True if the model is loaded and warmed
+        """
+        self._load_model()
+        if not self.summarizer:
+            return False
+        started = time.perf_counter()
+        sample = "The city council approved a new budget on Tuesday. " * 8
+        self._generate([sample, sample[:200]], max_length=40, min_length=10)
+        self.warmup_seconds = round(time.perf_counter() - started, 3)
+        self.warmed = True
+        return True
+    
+    def status(self) -> dict:
+        """Report load state and timings for health checks."""
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "loaded": self.summarizer is not None,
+            "tried_loading": self.tried_loading,
+            "warmed": self.warmed,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds
+        }
+    
+    def summarize(self, text: str, max_length: int = 150, min_length: int = 30, mode: str = "abstractive") -> str:
         """
         Summarize the given text.
         
@@ -33,50 +88,187 @@ class NewsSummarizer:
             text: Input text to summarize
             max_length: Maximum length of summary
             min_length: Minimum length of summary
+            mode: "fast" (extractive), "abstractive" (BART) or "auto" (BART only if already loaded)
         
         Returns:
             Summarized text
         """
+        if mode == "auto":
+            mode = "abstractive" if self.is_loaded() else "fast"
+        if mode == "fast":
+            return self.summarize_fast(text, max_length)
+        return self.summarize_batch([text], max_length=max_length, min_length=min_length)[0]
+    
+    def summarize_fast(self, text: str, max_length: int = 150) -> str:
+        """Sub-millisecond extractive summary that never touches the transformer."""
         if not text or len(text.strip()) < 50:
             return "Text too short for summarization"
+        return extractive_summarizer.summarize(text, max_length)
+    
+    def is_loaded(self) -> bool:
+        """True once the abstractive model is loaded and can serve without a cold start."""
+        return self.summarizer is not None
+    
+    def summarize_batch(self, texts: List[str], max_length: int = 150, min_length: int = 30) -> List[str]:
+        """
+        Summarize several texts with batched forward passes.
+        
+        All chunks of all texts share one map pass; articles longer than one
+        window then share a second, reduce pass over their chunk summaries,
+        which applies min_length.
+        
+        Args:
+            texts: Input texts to summarize
+            max_length: Maximum length of each summary
+            min_length: Minimum length of each summary
+        
+        Returns:
+            Summaries in the same order as the inputs
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 50:
+                results[i] = "Text too short for summarization"
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        # Serve previously generated summaries straight from the content-addressed cache
+        keys = {i: self._cache_key(texts[i], max_length, min_length) for i in pending}
+        cached = result_cache.get_many(keys.values())
+        for i in pending:
+            if keys[i] in cached:
+                results[i] = cached[keys[i]]
+        
+        # Identical texts in one batch only go through the model once
+        to_run = list({keys[i]: i for i in pending if keys[i] not in cached}.values())
+        if not to_run:
+            return results
         
         try:
             # Trigger lazy load
             self._load_model()
             
             if self.summarizer:
-                # Truncate text if too long (BART has input limits)
-                if len(text) > 1024:
-                    text = text[:1024]
+                # Map: every chunk of every article goes through batched forward passes
+                chunked = [self._chunk_text(texts[i]) for i in to_run]
+                flat = [chunk for chunks in chunked for chunk in chunks]
+                chunk_summaries = self._map(chunked, flat, max_length, min_length)
                 
-                result = self.summarizer(
-                    text,
-                    max_length=max_length,
-                    min_length=min_length,
-                    do_sample=False
-                )
-                return result[0]['summary_text']
+                # Reduce: multi-chunk articles get one more batched pass over their joined chunk summaries
+                fresh = {}
+                reduce_inputs, reduce_keys = [], []
+                position = 0
+                for i, chunks in zip(to_run, chunked):
+                    parts = chunk_summaries[position:position + len(chunks)]
+                    position += len(chunks)
+                    if len(parts) == 1:
+                        fresh[keys[i]] = parts[0]
+                    else:
+                        reduce_inputs.append(" ".join(parts))
+                        reduce_keys.append(keys[i])
+                if reduce_inputs:
+                    for key, summary in zip(reduce_keys, self._generate(reduce_inputs, max_length, min_length)):
+                        fresh[key] = summary
+                
+                result_cache.set_many(fresh)
+                for i in pending:
+                    if results[i] is None:
+                        results[i] = fresh[keys[i]]
             else:
                 # Fallback: simple extractive summarization
-                return self._simple_summarize(text, max_length)
+                for i in pending:
+                    if results[i] is None:
+                        results[i] = self._simple_summarize(texts[i], max_length)
         except Exception as e:
             print(f"Error in summarization: {e}")
-            return self._simple_summarize(text, max_length)
+            for i in pending:
+                if results[i] is None:
+                    results[i] = self._simple_summarize(texts[i], max_length)
+        
+        return results
     
-    def _simple_summarize(self, text: str, max_length: int) -> str:
-        """Simple extractive summarization as fallback."""
-        sentences = text.split('. ')
-        if len(sentences) <= 2:
-            return text
+    def _map(self, chunked: List[List[str]], flat: List[str], max_length: int, min_length: int) -> List[str]:
+        """
+        Summarize every chunk in `flat` in one batched call.
         
-        # Take first few sentences as summary
-        summary_sentences = sentences[:3]
-        summary = '. '.join(summary_sentences)
+        Chunks of a multi-chunk article are only reduced again, so the article
+        needs min_length / number of chunks from each, clamped to its shortest
+        chunk's token count; otherwise short tail chunks are padded out to the
+        full minimum. A single-chunk article's summary is final and needs the
+        caller's min_length. The pipeline takes one minimum per call, so the
+        map pass uses the smallest of these per-article values.
+        """
+        multi = [chunk for chunks in chunked if len(chunks) > 1 for chunk in chunks]
+        lengths = iter([len(ids) for ids in self.summarizer.tokenizer(multi, add_special_tokens=False)["input_ids"]] if multi else [])
+        minimum = min_length
+        for chunks in chunked:
+            if len(chunks) > 1:
+                shortest = min(next(lengths) for _ in chunks)
+                minimum = min(minimum, min_length // len(chunks), shortest)
+        return self._generate(flat, max_length, minimum)
+    
+    def _generate(self, inputs: List[str], max_length: int, min_length: int) -> List[str]:
+        """Run one padded, batched summarization call."""
+        outputs = self.summarizer(
+            inputs,
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            truncation=True,
+            batch_size=len(inputs)
+        )
+        return [output['summary_text'] for output in outputs]
+    
+    def _chunk_text(self, text: str) -> List[str]:
+        """
+        Split text into sentence-aligned windows of at most `chunk_tokens` tokens.
+        
+        When an article needs more than `max_chunks` windows, evenly spaced windows
+        are kept so the summary still covers the whole article within the budget.
+        """
+        sentences = [s for s in SENTENCE_BOUNDARY.split(text.strip()) if s]
+        if len(sentences) <= 1:
+            return [text]
         
-        if not summary.endswith('.'):
-            summary += '.'
+        # Tokenize all sentences in one call to get their lengths
+        lengths = [len(ids) for ids in self.summarizer.tokenizer(sentences, add_special_tokens=False)["input_ids"]]
         
-        return summary[:max_length]
+        chunks, current, current_tokens = [], [], 0
+        for sentence, n_tokens in zip(sentences, lengths):
+            if current and current_tokens + n_tokens > self.chunk_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(sentence)
+            current_tokens += n_tokens
+        if current:
+            chunks.append(" ".join(current))
+        
+        if len(chunks) > self.max_chunks:
+            if self.max_chunks <= 1:
+                return chunks[:1]
+            step = (len(chunks) - 1) / (self.max_chunks - 1)
+            chunks = [chunks[round(k * step)] for k in range(self.max_chunks)]
+        return chunks
+    
+    def _cache_key(self, text: str, max_length: int, min_length: int) -> str:
+        """Content-addressed cache key for a summary of `text` with these generation settings."""
+        return result_cache.make_key(
+            text, self.cache_model,
+            backend=self.cache_backend, max_length=max_length, min_length=min_length,
+            chunk_tokens=self.chunk_tokens, max_chunks=self.max_chunks
+        )
+    
+    def cached_summary(self, text: str, max_length: int = 150, min_length: int = 30) -> Optional[str]:
+        """Return a previously generated summary from the in-memory cache, if any."""
+        return result_cache.get_memory(self._cache_key(text, max_length, min_length))
+    
+    def _simple_summarize(self, text: str, max_length: int) -> str:
+        """Extractive summarization as fallback when BART is unavailable."""
+        return extractive_summarizer.summarize(text, max_length)
 
 # Global instance (placeholder - model won't load until .summarize() is called)
 summarizer = NewsSummarizer()
\ No newline at end of file
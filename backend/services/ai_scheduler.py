@@ -0,0 +1,298 @@
+import os
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Priority classes: lower runs first
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Published default rate limits (entry tiers); override with AI_{PROVIDER}_RPM, 0 disables the limit
+DEFAULT_RPM = {"gemini": 15, "openai": 500, "claude": 50, "groq": 30, "ollama": 0}
+DEFAULT_CONCURRENCY = {"ollama": 2}
+
+
+class ProviderBusy(Exception):
+    """An interactive request waited longer than the queue timeout for a provider slot."""
+
+    def __init__(self, provider: str, waited: float):
+        super().__init__(f"{provider} queue wait exceeded {waited:.1f}s")
+        self.provider = provider
+
+
+class ProviderQueue:
+    """
+    Concurrency slots plus a requests-per-minute token bucket for one LLM provider.
+
+    Waiters are served strictly by priority class, then arrival order. Background
+    work may hold at most `background_slots` of the slots, and a running
+    background call is preempted (cancelled and requeued by the scheduler) when
+    an interactive request arrives and no slot is free.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, rpm: int, background_share: float = 0.5):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.background_slots = max(1, math.floor(self.max_concurrency * background_share))
+        self.rpm = max(0, rpm)
+        self.burst = max(1.0, min(float(self.rpm), float(self.max_concurrency))) if self.rpm else 0.0
+        self.tokens = self.burst
+        self.refilled_at = time.monotonic()
+        self.paused_until = 0.0
+
+        self._waiters: List[Any] = []
+        self._sequence = itertools.count()
+        self._running: Dict[asyncio.Task, int] = {}
+        self._preemptible = set()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._loop = None
+
+        self.admitted = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.total_wait = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.max_wait = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.timeouts = 0
+        self.preempted = 0
+        self.rate_limited = 0
+
+    def _bind_loop(self):
+        # Futures and timers belong to one event loop; start clean if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._waiters = []
+            self._running = {}
+            self._preemptible = set()
+            self._wakeup = None
+
+    def _refill(self, now: float):
+        if self.rpm:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rpm / 60.0)
+        self.refilled_at = now
+
+    def _running_count(self, priority: int) -> int:
+        return sum(1 for p in self._running.values() if p == priority)
+
+    def _dispatch(self):
+        """Hand free slots (and rate tokens) to the highest-priority waiters."""
+        self._wakeup = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters:
+            priority, _, future, task = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if len(self._running) >= self.max_concurrency:
+                return
+            if priority == BACKGROUND and self._running_count(BACKGROUND) >= self.background_slots:
+                # The head is background, so no interactive request is waiting either
+                return
+            if now < self.paused_until or (self.rpm and self.tokens < 1.0):
+                delay = max(self.paused_until - now, (1.0 - self.tokens) * 60.0 / self.rpm if self.rpm else 0.0)
+                self._wakeup = self._loop.call_later(max(delay, 0.001), self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            if self.rpm:
+                self.tokens -= 1.0
+            self._running[task] = priority
+            future.set_result(None)
+
+    def _preempt(self):
+        """Cancel the most recently started background call to make room for interactive work."""
+        for task, priority in reversed(list(self._running.items())):
+            if priority == BACKGROUND and task in self._preemptible and not getattr(task, "preempted", False):
+                task.preempted = True
+                task.cancel()
+                self.preempted += 1
+                return
+
+    async def acquire(self, priority: int, timeout: Optional[float] = None, preemptible: bool = False) -> asyncio.Task:
+        """
+        Wait for a slot; raise ProviderBusy if `timeout` passes first.
+
+        Returns:
+            The task holding the slot, to pass to release()
+        """
+        self._bind_loop()
+        task = asyncio.current_task()
+        future = self._loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future, task))
+        started = time.perf_counter()
+        if self._wakeup is None:
+            self._dispatch()
+        if not future.done() and priority == INTERACTIVE and len(self._running) >= self.max_concurrency:
+            self._preempt()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done():
+                # Granted just as the wait ended; hand the slot on instead of leaking it
+                self.release(task)
+            else:
+                future.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.timeouts += 1
+            raise ProviderBusy(self.name, time.perf_counter() - started)
+        if preemptible:
+            self._preemptible.add(task)
+        waited = time.perf_counter() - started
+        self.admitted[priority] += 1
+        self.total_wait[priority] += waited
+        self.max_wait[priority] = max(self.max_wait[priority], waited)
+        return task
+
+    def release(self, task: asyncio.Task):
+        self._running.pop(task, None)
+        self._preemptible.discard(task)
+        if self._wakeup is None:
+            self._dispatch()
+
+    def throttle(self, seconds: float):
+        """Provider reported a rate limit: stop issuing requests for `seconds`."""
+        self.rate_limited += 1
+        self.tokens = 0.0
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def expected_wait(self, latency: float) -> float:
+        """Rough delay before a new interactive request would start: the slowest of slots, rate tokens and pauses."""
+        now = time.monotonic()
+        backlog = max(0, len(self._running) + self.queued(INTERACTIVE) - self.max_concurrency + 1)
+        wait = backlog * latency / self.max_concurrency
+        if self.rpm:
+            self._refill(now)
+            deficit = self.queued(INTERACTIVE) + 1 - self.tokens
+            wait = max(wait, deficit * 60.0 / self.rpm)
+        return max(wait, self.paused_until - now)
+
+    def queued(self, priority: Optional[int] = None) -> int:
+        return sum(1 for p, _, future, _ in self._waiters if not future.done() and (priority is None or p == priority))
+
+    def stats(self) -> Dict[str, Any]:
+        classes = {}
+        for priority, label in PRIORITY_NAMES.items():
+            admitted = self.admitted[priority]
+            classes[label] = {
+                "running": self._running_count(priority),
+                "queued": self.queued(priority),
+                "admitted": admitted,
+                "avg_wait_ms": round(self.total_wait[priority] / admitted * 1000, 2) if admitted else 0.0,
+                "max_wait_ms": round(self.max_wait[priority] * 1000, 2)
+            }
+        self._refill(time.monotonic())
+        return {
+            "max_concurrency": self.max_concurrency,
+            "background_slots": self.background_slots,
+            "rpm": self.rpm,
+            "rate_tokens": round(self.tokens, 2) if self.rpm else None,
+            "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            "timeouts": self.timeouts,
+            "preempted": self.preempted,
+            "rate_limited": self.rate_limited,
+            **classes
+        }
+
+
+class AIScheduler:
+    """
+    Admission control for LLM provider calls.
+
+    Every provider gets its own ProviderQueue so a traffic spike queues inside
+    the process instead of tripping provider rate limits. Interactive requests
+    give up after `queue_timeout` seconds (letting the router fail over to
+    another provider); background prefetch waits as long as it takes, yields
+    to queued interactive work and is requeued when preempted.
+    """
+
+    def __init__(self, queues: Dict[str, ProviderQueue], queue_timeout: float = 15.0, rate_limit_pause: float = 10.0):
+        self.queues = queues
+        self.queue_timeout = queue_timeout
+        self.rate_limit_pause = rate_limit_pause
+
+    def expected_wait(self, provider: str, latency: float) -> float:
+        """Rough queueing delay a new interactive request would see on `provider`."""
+        queue = self.queues.get(provider)
+        if queue is None:
+            return 0.0
+        return queue.expected_wait(latency)
+
+    @asynccontextmanager
+    async def slot(self, provider: str, priority: int = INTERACTIVE):
+        """Hold one slot on `provider` for the duration of the block (no preemption)."""
+        queue = self.queues.get(provider)
+        if queue is None:
+            yield
+            return
+        # Held by a streaming generator, which may be closed from a different task
+        task = await queue.acquire(priority, self.queue_timeout if priority == INTERACTIVE else None)
+        try:
+            yield
+        finally:
+            queue.release(task)
+
+    async def run(self, provider: str, priority: int, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `call()` under `provider`'s limits; preempted background calls are retried."""
+        queue = self.queues.get(provider)
+        if queue is None:
+            return await call()
+        while True:
+            task = await queue.acquire(priority, self.queue_timeout if priority == INTERACTIVE else None, preemptible=True)
+            try:
+                return await call()
+            except asyncio.CancelledError:
+                if not getattr(task, "preempted", False):
+                    raise
+                task.preempted = False
+                if task.uncancel() > 0:
+                    # Also cancelled by someone else; honour that
+                    raise
+            except Exception as e:
+                if _is_rate_limit(e):
+                    queue.throttle(self.rate_limit_pause)
+                raise
+            finally:
+                queue.release(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_timeout_seconds": self.queue_timeout,
+            "providers": {name: queue.stats() for name, queue in self.queues.items()}
+        }
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    """True for an HTTP 429 from any provider."""
+    # OpenAI/Groq/Claude SDK errors carry status_code, httpx errors carry the response, Gemini's api_core errors a code
+    for status in (
+        getattr(error, "status_code", None),
+        getattr(getattr(error, "response", None), "status_code", None),
+        getattr(error, "code", None)
+    ):
+        if status == 429:
+            return True
+    # Ollama's httpx calls raise plain exceptions with the status in the message
+    return str(error).startswith("Ollama returned status code 429")
+
+
+def scheduler_from_env(providers: List[str]) -> AIScheduler:
+    """Build a scheduler for `providers`, tunable via AI_{PROVIDER}_MAX_CONCURRENCY / AI_{PROVIDER}_RPM."""
+    share = float(os.getenv("AI_BACKGROUND_SHARE", "0.5"))
+    queues = {}
+    for name in providers:
+        prefix = f"AI_{name.upper()}"
+        queues[name] = ProviderQueue(
+            name,
+            max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(DEFAULT_CONCURRENCY.get(name, 8)))),
+            rpm=int(os.getenv(f"{prefix}_RPM", str(DEFAULT_RPM.get(name, 0)))),
+            background_share=share
+        )
+    return AIScheduler(
+        queues,
+        queue_timeout=float(os.getenv("AI_QUEUE_TIMEOUT", "15")),
+        rate_limit_pause=float(os.getenv("AI_RATE_LIMIT_PAUSE", "10"))
+    )
@@ -0,0 +1,189 @@
+import os
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ml_models.summarizer import summarizer
+from ml_models.sentiment import sentiment_analyzer
+from services.model_executor import model_executor, limiters
+from services.inference_queue import summarize_queue, sentiment_queue
+
+
+class EnrichmentWorker:
+    """
+    Optional low-priority enrichment of freshly fetched articles (ENRICH_ON_INGEST=1).
+
+    Articles returned by /news are queued here, summarized and scored in small
+    batches on the model pool, and the results are attached inline to later
+    /news responses. Interactive inference wins: the worker waits until the
+    summarize and sentiment endpoints and their batchers are idle (woken by
+    their idle events, for at most `max_defer` seconds so it cannot starve),
+    only starts work at batch boundaries, and sleeps after each batch so it
+    uses at most `cpu_budget` of the model pool's time.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        batch_size: int = 4,
+        cpu_budget: float = 0.25,
+        store_size: int = 2000,
+        summary_mode: str = "abstractive",
+        sentiment_mode: str = "fast",
+        max_defer: float = 30.0
+    ):
+        self.enabled = enabled
+        self.batch_size = max(1, batch_size)
+        self.cpu_budget = min(1.0, max(0.01, cpu_budget))
+        self.store_size = store_size
+        self.summary_mode = summary_mode
+        self.sentiment_mode = sentiment_mode
+        self.max_defer = max(0.0, max_defer)
+
+        self.store: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending: Dict[str, float] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop = None
+
+        self.processed = 0
+        self.deferrals = 0
+        self.forced = 0
+        self.busy_seconds = 0.0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self):
+        """Start the worker on the running event loop (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task and not self._task.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+        # Anything queued on a previous loop is gone; let it be resubmitted
+        self._pending = {}
+
+    def submit(self, articles: List[Dict[str, Any]]):
+        """Queue articles that have not been enriched yet."""
+        if not self.enabled:
+            return
+        self.start()
+        now = time.time()
+        for article in articles:
+            url = article.get("url")
+            if not url or url in self.store or url in self._pending:
+                continue
+            self._pending[url] = now
+            self._queue.put_nowait(article)
+
+    def attach(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add stored enrichment inline to each article that has it."""
+        for article in articles:
+            enrichment = self.store.get(article.get("url"))
+            if enrichment is not None:
+                article["enrichment"] = enrichment
+        return articles
+
+    @staticmethod
+    def _interactive_sources() -> List[Any]:
+        """User-facing work that shares the model pool (intelligence calls are LLM I/O and don't)."""
+        return [limiters["summarize"], limiters["sentiment"], summarize_queue, sentiment_queue]
+
+    def _interactive_busy(self) -> bool:
+        """True while user-facing model requests are running or queued."""
+        return any(source.busy for source in self._interactive_sources())
+
+    async def _wait_for_idle(self):
+        """Wait until interactive inference drains, giving up after max_defer seconds."""
+        deadline = time.monotonic() + self.max_defer
+        while self._interactive_busy():
+            self.deferrals += 1
+            remaining = deadline - time.monotonic()
+            try:
+                for source in self._interactive_sources():
+                    if source.busy:
+                        await asyncio.wait_for(source.wait_idle(), max(0.0, remaining))
+                        remaining = deadline - time.monotonic()
+            except asyncio.TimeoutError:
+                self.forced += 1
+                return
+
+    def _enrich_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Blocking batch enrichment (runs on the model pool)."""
+        if self.summary_mode == "fast":
+            summaries = [summarizer.summarize_fast(text) for text in texts]
+        else:
+            summaries = summarizer.summarize_batch(texts)
+        if self.sentiment_mode == "fast":
+            sentiments = sentiment_analyzer.analyze_fast_batch(texts)
+        else:
+            sentiments = sentiment_analyzer.analyze_batch(texts)
+        return [{"summary": summary, "sentiment": sentiment} for summary, sentiment in zip(summaries, sentiments)]
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Low priority: wait for interactive inference to drain before touching the model pool
+            await self._wait_for_idle()
+
+            texts = [article.get("content") or article.get("description") or article.get("title") or "" for article in batch]
+            started = time.perf_counter()
+            try:
+                results = await model_executor.run(self._enrich_batch, texts)
+            except Exception as e:
+                print(f"⚠️ Background enrichment batch failed: {e}")
+                results = [None] * len(batch)
+            elapsed = time.perf_counter() - started
+            self.busy_seconds += elapsed
+
+            now = time.time()
+            for article, result in zip(batch, results):
+                url = article.get("url")
+                enqueued_at = self._pending.pop(url, now)
+                if result is None:
+                    continue
+                result["enriched_at"] = now
+                self.store[url] = result
+                self.store.move_to_end(url)
+                self.processed += 1
+                self.last_lag = now - enqueued_at
+                self.max_lag = max(self.max_lag, self.last_lag)
+            while len(self.store) > self.store_size:
+                self.store.popitem(last=False)
+
+            # CPU budget: stay idle long enough that enrichment uses at most cpu_budget of the pool
+            await asyncio.sleep(elapsed * (1.0 - self.cpu_budget) / self.cpu_budget)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report enrichment throughput and lag."""
+        oldest = min(self._pending.values()) if self._pending else None
+        return {
+            "enabled": self.enabled,
+            "queued": len(self._pending),
+            "processed": self.processed,
+            "stored": len(self.store),
+            "deferrals": self.deferrals,
+            "forced_after_max_defer": self.forced,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "cpu_budget": self.cpu_budget,
+            "last_lag_seconds": round(self.last_lag, 3),
+            "max_lag_seconds": round(self.max_lag, 3),
+            "oldest_pending_seconds": round(time.time() - oldest, 3) if oldest else 0.0
+        }
+
+
+# Global instance
+enrichment_worker = EnrichmentWorker(
+    enabled=os.getenv("ENRICH_ON_INGEST", "").lower() in ("1", "true", "yes"),
+    batch_size=int(os.getenv("ENRICH_BATCH_SIZE", "4")),
+    cpu_budget=float(os.getenv("ENRICH_CPU_BUDGET", "0.25")),
+    store_size=int(os.getenv("ENRICH_STORE_SIZE", "2000")),
+    summary_mode=os.getenv("ENRICH_SUMMARY_MODE", "abstractive"),
+    sentiment_mode=os.getenv("ENRICH_SENTIMENT_MODE", "fast"),
+    max_defer=float(os.getenv("ENRICH_MAX_DEFER", "30"))
+)
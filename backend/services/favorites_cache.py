@@ -0,0 +1,266 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Shared tier and version counters; without it versions live in this process only
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Seconds a cached page is kept (and, without Redis, how stale another worker's copy may get)
+FAVORITES_CACHE_TTL = float(os.getenv("FAVORITES_CACHE_TTL", "60"))
+FAVORITES_CACHE_ENTRIES = int(os.getenv("FAVORITES_CACHE_ENTRIES", "4096"))
+
+# Seconds a Redis call may take before the request falls back to the database
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.25"))
+
+KEY_PREFIX = "newshub:favorites"
+
+
+class FavoritesCache:
+    """
+    Write-through cache in front of the favorites list.
+
+    Every user has a version counter that each write bumps once the database
+    has committed. Cached pages are keyed by that version, so a write
+    invalidates every page of the user's list at once; the version also
+    becomes the list's ETag, letting clients revalidate without a query.
+
+    Pages live in a bounded in-process LRU. With REDIS_URL set, versions are
+    Redis counters shared by all workers and pages are also stored in Redis,
+    so a write on one worker is seen by the next read on any other; a read
+    then costs one Redis GET plus a memory lookup. Without Redis, versions are
+    per process and renewed every FAVORITES_CACHE_TTL seconds, so another
+    worker's pages and ETags are at most that stale. Redis failures fall back
+    to the database.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: float = 60.0, max_entries: int = 4096):
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.store = None
+        self.redis = None
+        self._redis_checked = False
+
+        # (user, page key) -> (version, payload, monotonic time stored)
+        self._pages: "OrderedDict[Tuple[str, str], Tuple[int, Dict[str, Any], float]]" = OrderedDict()
+        # Versions are taken from the clock so a restart (or a flushed Redis) never reissues an old ETag.
+        # Without Redis: user -> (version, monotonic time issued)
+        self._versions: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+
+    def attach_store(self, store):
+        """Use `store` (an AsyncDatabase) for reads and writes."""
+        self.store = store
+
+    def _client(self):
+        """Redis client, created on first use; None when REDIS_URL is unset or the package is missing."""
+        if not self._redis_checked:
+            self._redis_checked = True
+            if self.redis_url:
+                try:
+                    import redis.asyncio as aioredis
+                    self.redis = aioredis.from_url(
+                        self.redis_url,
+                        decode_responses=True,
+                        socket_timeout=REDIS_TIMEOUT,
+                        socket_connect_timeout=REDIS_TIMEOUT
+                    )
+                    print("✅ Favorites cache using Redis")
+                except ImportError:
+                    print("⚠️ REDIS_URL is set but the redis package is not installed; favorites cache is per process")
+        return self.redis
+
+    async def close(self):
+        if self.redis is not None:
+            await self.redis.aclose()
+            self.redis = None
+            self._redis_checked = False
+
+    def _version_key(self, user_id: str) -> str:
+        return f"{KEY_PREFIX}:version:{user_id}"
+
+    def _page_key(self, user_id: str, version: int, page: str) -> str:
+        return f"{KEY_PREFIX}:page:{user_id}:{version}:{page}"
+
+    async def version(self, user_id: str) -> Optional[int]:
+        """Current version of the user's list, or None when Redis is configured but unreachable."""
+        client = self._client()
+        if client is None:
+            entry = self._versions.get(user_id)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                return self._new_local_version(user_id)
+            self._versions.move_to_end(user_id)
+            return entry[0]
+        try:
+            version = await client.get(self._version_key(user_id))
+            if version is None:
+                # First read since the key was created or evicted: start above any version handed out before
+                await client.set(self._version_key(user_id), self._epoch_now(), nx=True)
+                version = await client.get(self._version_key(user_id))
+            return int(version)
+        except Exception as e:
+            self._redis_failed("version read", e)
+            return None
+
+    async def bump(self, user_id: str):
+        """Invalidate every cached page of the user's list; call after a write has committed."""
+        # Pages cached under older versions are never served again; the LRU evicts them
+        self.invalidations += 1
+        client = self._client()
+        if client is None:
+            self._new_local_version(user_id)
+            return
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                # NX seeds a missing key from the clock; INCR then moves every reader onto a new version
+                pipe.set(self._version_key(user_id), self._epoch_now(), nx=True)
+                pipe.incr(self._version_key(user_id))
+                await pipe.execute()
+        except Exception as e:
+            # The write has landed but other workers cannot be told; their pages expire after the TTL
+            self._pages = OrderedDict((key, entry) for key, entry in self._pages.items() if key[0] != user_id)
+            self._redis_failed("version bump", e)
+
+    @staticmethod
+    def etag(user_id: str, version: int, page: str) -> str:
+        digest = hashlib.sha1(f"{user_id}\n{page}".encode("utf-8")).hexdigest()[:12]
+        return f'W/"fav-{digest}-{version}"'
+
+    @staticmethod
+    def matches(if_none_match: Optional[str], etag: str) -> bool:
+        """True if an If-None-Match header names `etag` (or is `*`)."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or etag[2:] in tags
+
+    async def page(
+        self,
+        user_id: str,
+        version: Optional[int],
+        page: str,
+        load: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        The cached payload for one page of the user's list, loading and storing it on a miss.
+
+        Args:
+            user_id: Owner of the list
+            version: Version from version(); None bypasses the cache
+            page: Stable description of the page (limit and cursor)
+            load: Coroutine function that reads the page from the database
+
+        Returns:
+            The page payload
+        """
+        if version is None:
+            self.misses += 1
+            return await load()
+
+        key = (user_id, page)
+        entry = self._pages.get(key)
+        if entry is not None and entry[0] == version and time.monotonic() - entry[2] < self.ttl:
+            self._pages.move_to_end(key)
+            self.memory_hits += 1
+            return entry[1]
+
+        client = self._client()
+        if client is not None:
+            try:
+                cached = await client.get(self._page_key(user_id, version, page))
+            except Exception as e:
+                self._redis_failed("page read", e)
+                cached = None
+            if cached is not None:
+                payload = json.loads(cached)
+                self._remember(key, version, payload)
+                self.redis_hits += 1
+                return payload
+
+        self.misses += 1
+        payload = await load()
+        self._remember(key, version, payload)
+        if client is not None:
+            try:
+                await client.set(self._page_key(user_id, version, page), json.dumps(payload), ex=max(1, int(self.ttl)))
+            except Exception as e:
+                self._redis_failed("page write", e)
+        return payload
+
+    async def count(self, user_id: str, version: Optional[int], load: Callable[[], Awaitable[int]]) -> int:
+        """
+        Number of favorites in the user's list, cached under the same version as its pages.
+
+        A page miss (a new cursor or page size) then reuses the count instead of
+        running another COUNT(*); any write bumps the version and so recounts.
+        """
+        async def load_count() -> Dict[str, Any]:
+            return {"total": await load()}
+
+        # Page keys are "limit:cursor", so this key never collides with a page
+        return (await self.page(user_id, version, "count", load_count))["total"]
+
+    def _remember(self, key: Tuple[str, str], version: int, payload: Dict[str, Any]):
+        self._pages[key] = (version, payload, time.monotonic())
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+
+    def _new_local_version(self, user_id: str) -> int:
+        previous = self._versions.pop(user_id, (0, 0.0))[0]
+        version = max(previous + 1, self._epoch_now())
+        self._versions[user_id] = (version, time.monotonic())
+        while len(self._versions) > self.max_entries:
+            # A forgotten user just gets a fresh version (one cache miss) on the next read
+            self._versions.popitem(last=False)
+        return version
+
+    def _epoch_now(self) -> int:
+        return time.time_ns() // 1000
+
+    def _redis_failed(self, operation: str, error: Exception):
+        self.redis_errors += 1
+        print(f"⚠️ Favorites cache Redis {operation} failed: {error}")
+
+    # Writes go to the database first, then bump the version
+
+    async def add(self, articles: List[dict], user_id: str) -> bool:
+        saved = await self.store.add_favorites(articles, user_id)
+        if saved:
+            await self.bump(user_id)
+        return saved
+
+    async def remove(self, urls: List[str], user_id: str) -> bool:
+        removed = await self.store.remove_favorites(urls, user_id)
+        if removed:
+            await self.bump(user_id)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.redis_hits + self.misses
+        return {
+            "backend": "redis" if self.redis is not None else "memory",
+            "entries": len(self._pages),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.redis_hits) / lookups, 3) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors
+        }
+
+
+# Global instance
+favorites_cache = FavoritesCache(REDIS_URL, ttl=FAVORITES_CACHE_TTL, max_entries=FAVORITES_CACHE_ENTRIES)
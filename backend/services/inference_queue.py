@@ -0,0 +1,172 @@
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ml_models.summarizer import summarizer
+from ml_models.sentiment import sentiment_analyzer
+from services.model_executor import model_executor
+
+
+class MicroBatcher:
+    """
+    Collects concurrent inference requests into batches.
+
+    A single consumer task drains the queue: it waits for the first request,
+    then keeps collecting until either `max_batch_size` items are gathered or
+    `max_wait_ms` has elapsed. While a batch is running on the model, new
+    requests pile up in the queue, so batch size grows with concurrency.
+    Requests whose parameters differ (e.g. summary lengths) are grouped by
+    `key` and never share a forward pass.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any], Hashable], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        runner: Optional[Callable[..., Awaitable[Any]]] = None
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.runner = runner
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._idle: Optional[asyncio.Event] = None
+
+        # Submitted items not yet answered (queued or running)
+        self.in_flight = 0
+        self.batches_run = 0
+        self.items_processed = 0
+        self.largest_batch = 0
+
+    def _ensure_worker(self):
+        """Start (or restart) the consumer task on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker and not self._worker.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._worker = loop.create_task(self._consume())
+        self._update_idle()
+
+    def _update_idle(self):
+        if self._idle is not None:
+            if self.in_flight:
+                self._idle.clear()
+            else:
+                self._idle.set()
+
+    @property
+    def busy(self) -> bool:
+        """True while any submitted item is queued or running."""
+        return self.in_flight > 0
+
+    async def wait_idle(self):
+        """Return once every submitted item has been answered."""
+        if self.in_flight and self._loop is asyncio.get_running_loop():
+            await self._idle.wait()
+
+    async def submit(self, item: Any, key: Hashable = ()) -> Any:
+        """
+        Queue a single item and wait for its result.
+
+        Args:
+            item: Input for the batch function (e.g. article text)
+            key: Parameters that must match for items to share a batch
+
+        Returns:
+            The batch function's result for this item
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self.in_flight += 1
+        self._update_idle()
+        try:
+            await self._queue.put((item, key, future))
+            return await future
+        finally:
+            self.in_flight -= 1
+            self._update_idle()
+
+    async def _collect(self) -> List[Tuple[Any, Hashable, asyncio.Future]]:
+        """Wait for one request, then gather more until the batch is full or the window closes."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _consume(self):
+        """Consumer loop: run one batched model call per parameter group."""
+        while True:
+            batch = await self._collect()
+
+            groups: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+            for item, key, future in batch:
+                if not future.cancelled():
+                    groups.setdefault(key, []).append((item, future))
+
+            for key, entries in groups.items():
+                items = [item for item, _ in entries]
+                try:
+                    if self.runner:
+                        results = await self.runner(self.batch_fn, items, key)
+                    else:
+                        results = await self._loop.run_in_executor(None, self.batch_fn, items, key)
+                except Exception as e:
+                    for _, future in entries:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                self.batches_run += 1
+                self.items_processed += len(items)
+                self.largest_batch = max(self.largest_batch, len(items))
+                for (_, future), result in zip(entries, results):
+                    if not future.done():
+                        future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batching counters for monitoring."""
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": self.in_flight,
+            "batches_run": self.batches_run,
+            "items_processed": self.items_processed,
+            "avg_batch_size": round(self.items_processed / self.batches_run, 2) if self.batches_run else 0.0,
+            "largest_batch": self.largest_batch,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0
+        }
+
+
+def _summarize_batch(texts: List[str], key: Tuple[int, int]) -> List[str]:
+    max_length, min_length = key
+    return summarizer.summarize_batch(texts, max_length=max_length, min_length=min_length)
+
+
+def _sentiment_batch(texts: List[str], key: Hashable) -> List[dict]:
+    return sentiment_analyzer.analyze_batch(texts)
+
+
+MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "8"))
+MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "10"))
+
+# Global instances
+summarize_queue = MicroBatcher("summarize", _summarize_batch, MAX_BATCH_SIZE, MAX_WAIT_MS, runner=model_executor.run)
+sentiment_queue = MicroBatcher("sentiment", _sentiment_batch, MAX_BATCH_SIZE, MAX_WAIT_MS, runner=model_executor.run)
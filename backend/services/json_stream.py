@@ -0,0 +1,81 @@
+import json
+from typing import Any, List, Tuple
+
+
+class JSONSectionParser:
+    """
+    Incremental parser for a streamed top-level JSON object.
+
+    Text chunks are fed in as they arrive from an LLM stream. Each time a
+    top-level member (e.g. "summary": {...}) is closed, it is decoded and
+    returned, so the caller can forward that section before the rest of the
+    object has been generated. Anything before the opening brace (such as a
+    markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.member_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of text.
+
+        Returns:
+            (key, value) pairs for every top-level member completed by this chunk
+        """
+        if self.done or not chunk:
+            return []
+        self.buffer += chunk
+        sections = []
+        buffer = self.buffer
+        for i in range(self.pos, len(buffer)):
+            ch = buffer[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if self.depth == 0:
+                # Skip any preamble until the object opens
+                if ch == "{":
+                    self.depth = 1
+                    self.member_start = i + 1
+                continue
+
+            if ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                if self.depth == 1:
+                    sections.extend(self._close_member(i))
+                    self.done = True
+                    self.depth = 0
+                    self.pos = i + 1
+                    return sections
+                self.depth -= 1
+            elif ch == "," and self.depth == 1:
+                sections.extend(self._close_member(i))
+                self.member_start = i + 1
+        self.pos = len(buffer)
+        return sections
+
+    def _close_member(self, end: int) -> List[Tuple[str, Any]]:
+        member = self.buffer[self.member_start:end].strip()
+        if not member:
+            return []
+        try:
+            return list(json.loads("{" + member + "}").items())
+        except json.JSONDecodeError:
+            # Malformed member; leave it for the caller's full-document parse
+            return []
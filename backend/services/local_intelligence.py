@@ -0,0 +1,236 @@
+import asyncio
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from ml_models.summarizer import summarizer
+from ml_models.sentiment import sentiment_analyzer
+from ml_models.recommend import recommender
+from services.model_executor import model_executor
+from services.inference_queue import summarize_queue, sentiment_queue
+
+# Summary settings shared with /summarize so both hit the same result-cache entries
+SUMMARY_MAX_LENGTH = 150
+SUMMARY_MIN_LENGTH = 30
+
+WORD_PATTERN = re.compile(r"[a-z][a-z'-]*[a-z]")
+SENTENCE_SPLIT = re.compile(r"[.!?]+")
+LEFT_MARKERS = re.compile(r"democrat|biden|left-wing|liberal")
+RIGHT_MARKERS = re.compile(r"republican|trump|right-wing|conservative")
+
+# Words that are frequent in news copy but useless as tags (on top of the recommender's TF-IDF stop words)
+NEWS_STOP_WORDS = frozenset({
+    "about", "again", "could", "would", "should", "world", "people", "years", "state", "government",
+    "president", "reported", "report", "reports", "says", "said", "according", "news", "today",
+    "week", "month", "year", "new", "also", "just", "like", "make", "made", "time"
+})
+MIN_TAG_LENGTH = 4
+# Words in the title count more than words further down the article
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 2
+CONTENT_SCAN_CHARS = 2000
+DEFAULT_TAGS = ["news", "report", "update"]
+
+
+@lru_cache(maxsize=1)
+def stop_words() -> FrozenSet[str]:
+    """sklearn's English stop words plus NEWS_STOP_WORDS; sklearn is only imported on the first local analysis."""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    return ENGLISH_STOP_WORDS | NEWS_STOP_WORDS
+
+
+def _candidate_counts(title: str, description: str, content: str) -> Counter:
+    """Weighted term frequencies of unigrams and adjacent-word bigrams."""
+    counts = Counter()
+    skip = stop_words()
+    for text, weight in ((title, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT), (content[:CONTENT_SCAN_CHARS], 1)):
+        words = WORD_PATTERN.findall(text.lower())
+        for i, word in enumerate(words):
+            if word in skip:
+                continue
+            if len(word) >= MIN_TAG_LENGTH:
+                counts[word] += weight
+            if i + 1 < len(words) and words[i + 1] not in skip:
+                counts[word + " " + words[i + 1]] += weight
+    return counts
+
+
+def extract_tags(title: str, description: str, content: str, limit: int = 3) -> List[str]:
+    """
+    Rank candidate terms by weighted TF x IDF, using the recommender's fitted vocabulary.
+
+    Bigrams only qualify when the vectorizer knows them as a phrase. Unigrams
+    outside its (max_features-capped) vocabulary are rarer than anything in
+    it, so they get the highest observed IDF. Before the recommender has been
+    fitted, every term shares one IDF and frequency alone decides.
+    """
+    vectorizer = recommender.vectorizer
+    vocabulary = getattr(vectorizer, "vocabulary_", None) if recommender.is_fitted else None
+    idf = getattr(vectorizer, "idf_", None) if vocabulary is not None else None
+    default_idf = float(idf.max()) if idf is not None and len(idf) else 1.0
+
+    scored: List[Tuple[float, str]] = []
+    for term, count in _candidate_counts(title or "", description or "", content or "").items():
+        index = vocabulary.get(term) if vocabulary is not None else None
+        if index is not None and index < len(idf):
+            weight = float(idf[index])
+        elif " " in term:
+            continue
+        else:
+            weight = default_idf
+        scored.append((count * weight, term))
+    scored.sort(key=lambda item: (-item[0], -len(item[1])))
+
+    tags: List[str] = []
+    for _, term in scored:
+        # Skip a word already covered by a chosen phrase (and vice versa)
+        if any(term in tag.split() or tag in term.split() for tag in tags):
+            continue
+        tags.append(term)
+        if len(tags) == limit:
+            break
+    return tags or list(DEFAULT_TAGS)
+
+
+def _reading_difficulty(text: str) -> str:
+    avg_sentence_len = len(text) / max(len(SENTENCE_SPLIT.split(text)), 1)
+    if avg_sentence_len < 100:
+        return "Easy"
+    if avg_sentence_len > 250:
+        return "Hard"
+    return "Medium"
+
+
+def compose_analysis(
+    title: str,
+    description: str,
+    content: str,
+    summary_text: str,
+    sentiment_res: Dict[str, Any],
+    error_msg: Optional[str] = None
+) -> Dict[str, Any]:
+    """Assemble the intelligence schema from local model outputs and rule-based heuristics."""
+    tags = extract_tags(title, description, content)
+
+    # Mock political bias based on keyword matching
+    leaning = "Center"
+    bias_desc = "Objective reporting based on factual timeline."
+    lowered = description.lower()
+    if LEFT_MARKERS.search(lowered):
+        leaning = "Center-Left"
+        bias_desc = "Slight progressive emphasis in terminology."
+    elif RIGHT_MARKERS.search(lowered):
+        leaning = "Center-Right"
+        bias_desc = "Slight conservative framing or sourcing."
+
+    fallback_data = {
+        "summary": {
+            "one_minute": summary_text,
+            "tldr": [
+                f"Core details surrounding: {title[:50]}...",
+                description[:100] + "..." if description else "Read fully to understand political implications.",
+                "Analyzed via local backup NLP engine due to offline/unconfigured API state."
+            ],
+            "eli10": f"Something happened where {title.lower() if title.endswith('.') else title.lower() + '.'}"
+        },
+        "sentiment": {
+            "label": sentiment_res.get("label", "NEUTRAL"),
+            "score": sentiment_res.get("score", 0.5)
+        },
+        "political_analysis": {
+            "leaning": leaning,
+            "confidence": 0.6,
+            "bias_description": bias_desc
+        },
+        "domain_impact": {
+            "politics": "Medium - Subject of standard administrative review.",
+            "economy": "Low - No direct global market shocks reported.",
+            "business": "Low - Standard industrial adjustment period.",
+            "technology": "Low - Incremental technological integration.",
+            "environment": "None - No immediate environmental hazards identified.",
+            "future_outlook": "Expect further regulatory debate or policy updates in coming weeks."
+        },
+        "key_insights": [
+            f"Topic is trending under: {', '.join(tags)}.",
+            "Primary source reporting verified without immediate structural contradictions.",
+            f"NLP classification suggests a confidence score of {sentiment_res.get('score', 0.5)}."
+        ],
+        "metadata": {
+            "reading_difficulty": _reading_difficulty(content or description),
+            "tags": tags
+        }
+    }
+
+    if error_msg:
+        fallback_data["_fallback_notice"] = f"Local fallback triggered. LLM error: {error_msg}"
+
+    return fallback_data
+
+
+class LocalIntelligence:
+    """
+    Local-model intelligence used when no LLM provider is configured or all of them fail.
+
+    Summary and sentiment are requested at the same time, through the shared
+    micro-batchers, so concurrent fallbacks during a provider outage share
+    forward passes instead of queueing one article at a time. Results already
+    in the result cache are returned without touching the model pool. The
+    heuristics (tags, leaning, difficulty) are precompiled and run inline.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.articles = 0
+
+    async def _summary(self, text: str) -> str:
+        cached = summarizer.cached_summary(text, SUMMARY_MAX_LENGTH, SUMMARY_MIN_LENGTH)
+        if cached is not None:
+            return cached
+        return await summarize_queue.submit(text, key=(SUMMARY_MAX_LENGTH, SUMMARY_MIN_LENGTH))
+
+    async def _sentiment(self, text: str) -> Dict[str, Any]:
+        cached = sentiment_analyzer.cached_sentiment(text)
+        if cached is not None:
+            return cached
+        return await sentiment_queue.submit(text)
+
+    async def analyze(self, title: str, description: str, content: str, error_msg: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze one article with the local models."""
+        self.calls += 1
+        self.articles += 1
+        text = content or description
+        summary_text, sentiment_res = await asyncio.gather(self._summary(text), self._sentiment(text))
+        return compose_analysis(title, description, content, summary_text, sentiment_res, error_msg)
+
+    async def analyze_batch(self, articles: List[Dict[str, Any]], error_msg: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze many articles with one batched summary pass and one batched sentiment pass.
+
+        Args:
+            articles: Dicts with title, description and content
+
+        Returns:
+            One analysis per article, in input order
+        """
+        if not articles:
+            return []
+        self.calls += 1
+        self.articles += len(articles)
+        fields = [(a.get("title") or "", a.get("description") or "", a.get("content") or "") for a in articles]
+        texts = [content or description for _, description, content in fields]
+        summaries, sentiments = await asyncio.gather(
+            model_executor.run(summarizer.summarize_batch, texts, SUMMARY_MAX_LENGTH, SUMMARY_MIN_LENGTH),
+            model_executor.run(sentiment_analyzer.analyze_batch, texts)
+        )
+        return [
+            compose_analysis(title, description, content, summary_text, sentiment_res, error_msg)
+            for (title, description, content), summary_text, sentiment_res in zip(fields, summaries, sentiments)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "articles": self.articles}
+
+
+# Global instance
+local_intelligence = LocalIntelligence()
@@ -0,0 +1,197 @@
+import os
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+
+def _configure_torch_threads():
+    """Apply TORCH_NUM_THREADS / TORCH_INTEROP_THREADS once the first model worker starts."""
+    num_threads = os.getenv("TORCH_NUM_THREADS")
+    interop_threads = os.getenv("TORCH_INTEROP_THREADS")
+    if not num_threads and not interop_threads:
+        return
+    try:
+        import torch
+        if num_threads:
+            torch.set_num_threads(int(num_threads))
+        if interop_threads:
+            torch.set_num_interop_threads(int(interop_threads))
+        print(f"🧵 Torch threads configured: intra={torch.get_num_threads()}, inter={torch.get_num_interop_threads()}")
+    except Exception as e:
+        # torch missing, or interop threads already fixed by an earlier parallel region
+        print(f"⚠️ Could not configure torch threads: {e}")
+
+
+class ModelExecutor:
+    """
+    Dedicated thread pool for CPU-bound model work.
+
+    Transformers pipelines and sklearn release the GIL inside their native
+    kernels, so a small thread pool keeps the event loop free without having
+    to copy the model singletons into separate processes.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self.max_workers = max(1, max_workers)
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="model-worker",
+            initializer=_configure_torch_threads
+        )
+        self.submitted = 0
+        self.completed = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the model pool and await its result."""
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        try:
+            return await loop.run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool counters for monitoring."""
+        return {
+            "workers": self.max_workers,
+            "in_flight": self.submitted - self.completed,
+            "completed": self.completed
+        }
+
+
+class ServiceOverloaded(HTTPException):
+    """503 raised when an endpoint's admission queue is full."""
+
+    def __init__(self, endpoint: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy: too many pending {endpoint} requests, please retry shortly",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class EndpointLimiter:
+    """
+    Per-endpoint concurrency limit with a bounded wait queue.
+
+    Up to `max_concurrency` requests run at once and up to `max_queue` more
+    may wait for a slot. Anything beyond that is rejected immediately with
+    503 + Retry-After instead of piling up behind slow model calls.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, retry_after: int = 2):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._semaphore = None
+        self._idle: Optional[asyncio.Event] = None
+        self._loop = None
+
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.admitted = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._idle = asyncio.Event()
+            self._loop = loop
+            self._update_idle()
+        return self._semaphore
+
+    def _update_idle(self):
+        if self._idle is not None:
+            if self.busy:
+                self._idle.clear()
+            else:
+                self._idle.set()
+
+    @property
+    def busy(self) -> bool:
+        """True while any request holds or waits for a slot."""
+        return self.active > 0 or self.waiting > 0
+
+    async def wait_idle(self):
+        """Return once no request holds or waits for a slot."""
+        self._get_semaphore()
+        await self._idle.wait()
+
+    def check_admission(self):
+        """Raise ServiceOverloaded if a new request could neither run nor queue."""
+        if self.active >= self.max_concurrency and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ServiceOverloaded(self.name, self.retry_after)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of the block."""
+        semaphore = self._get_semaphore()
+        self.check_admission()
+
+        started = time.perf_counter()
+        self.waiting += 1
+        self._update_idle()
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            self.waiting -= 1
+            self._update_idle()
+            raise
+        self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        self.total_wait += time.perf_counter() - started
+        try:
+            yield
+        finally:
+            self.active -= 1
+            semaphore.release()
+            self._update_idle()
+
+    def has_capacity(self) -> bool:
+        """True if a new request would start immediately instead of queueing."""
+        return self.active < self.max_concurrency and self.waiting == 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return admission counters for monitoring."""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 2) if self.admitted else 0.0
+        }
+
+
+def _limiter_from_env(name: str, max_concurrency: int, max_queue: int) -> EndpointLimiter:
+    """Build a limiter overridable via {NAME}_MAX_CONCURRENCY and {NAME}_MAX_QUEUE."""
+    prefix = name.upper()
+    return EndpointLimiter(
+        name,
+        max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(max_concurrency))),
+        max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", str(max_queue))),
+        retry_after=int(os.getenv("OVERLOAD_RETRY_AFTER", "2"))
+    )
+
+
+# Global instances
+model_executor = ModelExecutor(max_workers=int(os.getenv("MODEL_WORKERS", "1")))
+
+limiters = {
+    "summarize": _limiter_from_env("summarize", max_concurrency=16, max_queue=64),
+    "sentiment": _limiter_from_env("sentiment", max_concurrency=32, max_queue=128),
+    "intelligence": _limiter_from_env("intelligence", max_concurrency=8, max_queue=32),
+    "recommend": _limiter_from_env("recommend", max_concurrency=8, max_queue=32)
+}
@@ -0,0 +1,196 @@
+import os
+import re
+import hashlib
+import time
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Per-article output schema shared by the single and batch prompts
+ANALYSIS_SCHEMA = """{
+  "summary": {
+    "one_minute": "A concise, engaging 1-minute summary of the article (3-4 sentences).",
+    "tldr": [
+      "Key bullet point 1",
+      "Key bullet point 2",
+      "Key bullet point 3"
+    ],
+    "eli10": "Explain Like I'm 10: A extremely simple explanation of the core concept/event."
+  },
+  "sentiment": {
+    "label": "POSITIVE",  // Must be POSITIVE, NEGATIVE, or NEUTRAL
+    "score": 0.85        // Float confidence score from 0.0 to 1.0
+  },
+  "political_analysis": {
+    "leaning": "Center-Left", // Must be Left, Center-Left, Center, Center-Right, or Right
+    "confidence": 0.75,      // Float confidence score from 0.0 to 1.0
+    "bias_description": "A clear, neutral explanation of any editorial or political bias in the framing, language, or sourcing of this article. If none, state that it is reported objectively."
+  },
+  "domain_impact": {
+    "politics": "High/Medium/Low/None - short detail of political consequences.",
+    "economy": "High/Medium/Low/None - short detail of financial/economic impact.",
+    "business": "High/Medium/Low/None - short detail of business/market impact.",
+    "technology": "High/Medium/Low/None - short detail of tech developments/adoption.",
+    "environment": "High/Medium/Low/None - short detail of environmental impacts.",
+    "future_outlook": "An AI-generated, forward-looking prediction of what happens next."
+  },
+  "key_insights": [
+    "Crucial insight or takeaway 1",
+    "Crucial insight or takeaway 2",
+    "Crucial insight or takeaway 3"
+  ],
+  "metadata": {
+    "reading_difficulty": "Easy", // Easy, Medium, or Hard
+    "tags": ["tag1", "tag2", "tag3"] // 3 to 5 relevant tags
+  }
+}"""
+
+# Top-level sections of ANALYSIS_SCHEMA; a provider analysis missing any of them is incomplete
+ANALYSIS_SECTIONS = ("summary", "sentiment", "political_analysis", "domain_impact", "key_insights", "metadata")
+
+# Static prefixes: byte-identical on every call so provider prompt caching can reuse them.
+# Everything that varies (the articles) goes after them.
+ARTICLE_INSTRUCTIONS = f"""You are an expert News Analyst and Senior Editor. Analyze the news article provided by the user and return a structured JSON response containing summaries, sentiment, political leaning, bias, impact analysis, key insights, and tags.
+
+IMPORTANT: You MUST return ONLY a raw JSON object matching the schema below. Do not output any conversational introductions, markdown explanations, or code blocks. The JSON must be valid and directly parseable.
+
+JSON Schema:
+{ANALYSIS_SCHEMA}"""
+
+BATCH_INSTRUCTIONS = f"""You are an expert News Analyst and Senior Editor. The user provides several news articles, each introduced by an [Article id=...] header. Analyze EACH article independently and return a structured JSON analysis for every one of them containing summaries, sentiment, political leaning, bias, impact analysis, key insights, and tags.
+
+IMPORTANT: You MUST return ONLY a raw JSON object of the form {{"results": [...]}}. The "results" array must contain exactly one object per article, in the same order, each with an "id" field copied from the article header plus every field of the per-article schema below. Do not output any conversational introductions, markdown explanations, or code blocks. The JSON must be valid and directly parseable.
+
+Per-article JSON Schema:
+{ANALYSIS_SCHEMA}"""
+
+# Bump PROMPT_REVISION for changes the prompt text does not capture (model swaps, post-processing).
+# Stored analyses are keyed on PROMPT_VERSION, so any change to either invalidates them.
+PROMPT_REVISION = "1"
+PROMPT_VERSION = PROMPT_REVISION + "-" + hashlib.sha256(
+    (ARTICLE_INSTRUCTIONS + BATCH_INSTRUCTIONS).encode("utf-8")
+).hexdigest()[:12]
+
+# Token budget for the article text appended after the prefix
+ARTICLE_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_ARTICLE_TOKENS", "3000"))
+
+# Word pieces of up to 6 characters plus individual punctuation marks track BPE token counts
+# for English news copy closely, at regex speed and without a tokenizer download
+TOKEN_ESTIMATE_PATTERN = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate of the LLM token count of `text`."""
+    return len(TOKEN_ESTIMATE_PATTERN.findall(text))
+
+
+def trim_to_tokens(text: str, budget: int) -> str:
+    """Cut `text` to roughly `budget` tokens, preferring to stop at a sentence end."""
+    if budget <= 0:
+        return ""
+    tokens = estimate_tokens(text)
+    if tokens <= budget:
+        return text
+    cut = int(len(text) * budget / tokens)
+    while cut > 0 and estimate_tokens(text[:cut]) > budget:
+        cut = int(cut * 0.9)
+    trimmed = text[:cut]
+    sentence_end = max(trimmed.rfind(". "), trimmed.rfind("! "), trimmed.rfind("? "))
+    if sentence_end > cut // 2:
+        trimmed = trimmed[:sentence_end + 1]
+    return trimmed.rstrip() + " [...]"
+
+
+def format_article(title: str, description: str, content: str, budget: int = ARTICLE_TOKEN_BUDGET) -> str:
+    """Article block for a prompt; the body is trimmed first so title and description always fit."""
+    head = f"Title: {title}\nDescription: {description}\nContent: "
+    return head + trim_to_tokens(content or "", budget - estimate_tokens(head))
+
+
+def content_hash(title: str, description: str, content: str) -> str:
+    """Fingerprint of the article text an analysis was produced from (whitespace-insensitive)."""
+    normalized = "\x1f".join(" ".join((part or "").split()) for part in (title, description, content))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class Prompt(NamedTuple):
+    """A prompt split into a cacheable static prefix (`system`) and the per-call article text (`user`)."""
+    system: str
+    user: str
+
+    @property
+    def text(self) -> str:
+        """Single-string form (prefix first) for providers without a separate system slot."""
+        return f"{self.system}\n\n{self.user}"
+
+    @property
+    def estimated_tokens(self) -> int:
+        return estimate_tokens(self.system) + estimate_tokens(self.user)
+
+
+def article_prompt(title: str, description: str, content: str) -> Prompt:
+    """Prompt for analyzing one article."""
+    return Prompt(ARTICLE_INSTRUCTIONS, "Article to analyze:\n" + format_article(title, description, content))
+
+
+def batch_prompt(items: List[Tuple[str, str]]) -> Prompt:
+    """Prompt for several (id, formatted article) pairs sharing one copy of the instructions."""
+    articles = "\n\n".join(f"[Article id={item_id}]\n{article}" for item_id, article in items)
+    return Prompt(BATCH_INSTRUCTIONS, f"Articles to analyze ({len(items)}):\n{articles}")
+
+
+class PromptUsage:
+    """
+    Per-provider prompt token accounting.
+
+    Records the provider-reported prompt and cached tokens (falling back to
+    the local estimate when a provider reports nothing) and the latency of
+    every call, so the effect of prefix caching and trimming is visible.
+    """
+
+    def __init__(self, recent: int = 50):
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self.recent = deque(maxlen=recent)
+
+    def record(
+        self,
+        provider: str,
+        estimated_tokens: int,
+        latency: float,
+        prompt_tokens: Optional[int] = None,
+        cached_tokens: Optional[int] = None
+    ):
+        totals = self.totals.setdefault(provider, {
+            "calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "estimated_tokens": 0, "latency_seconds": 0.0
+        })
+        totals["calls"] += 1
+        totals["prompt_tokens"] += prompt_tokens if prompt_tokens is not None else estimated_tokens
+        totals["cached_tokens"] += cached_tokens or 0
+        totals["estimated_tokens"] += estimated_tokens
+        totals["latency_seconds"] += latency
+        self.recent.append({
+            "provider": provider,
+            "at": time.time(),
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "estimated_tokens": estimated_tokens,
+            "latency_ms": round(latency * 1000, 1)
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        providers = {}
+        for provider, totals in self.totals.items():
+            calls = totals["calls"]
+            providers[provider] = {
+                "calls": calls,
+                "prompt_tokens": totals["prompt_tokens"],
+                "cached_tokens": totals["cached_tokens"],
+                "cache_hit_ratio": round(totals["cached_tokens"] / totals["prompt_tokens"], 3) if totals["prompt_tokens"] else 0.0,
+                "avg_prompt_tokens": round(totals["prompt_tokens"] / calls, 1),
+                "avg_estimated_tokens": round(totals["estimated_tokens"] / calls, 1),
+                "avg_latency_ms": round(totals["latency_seconds"] / calls * 1000, 1)
+            }
+        return {
+            "article_token_budget": ARTICLE_TOKEN_BUDGET,
+            "providers": providers,
+            "recent_calls": list(self.recent)[-10:]
+        }
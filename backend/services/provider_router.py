@@ -0,0 +1,280 @@
+import os
+import asyncio
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from services.ai_scheduler import INTERACTIVE, AIScheduler, ProviderBusy, scheduler_from_env
+from services.prompts import Prompt
+
+
+class ProviderStats:
+    """Rolling latency and error statistics for one LLM provider."""
+
+    def __init__(self, name: str, alpha: float = 0.2, window: int = 100):
+        self.name = name
+        self.alpha = alpha
+        self.samples = deque(maxlen=window)
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+        self.requests = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.samples.append(latency)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+        self.error_rate *= 1.0 - self.alpha
+        self.consecutive_failures = 0
+
+    def record_failure(self, max_failures: int, cooldown: float):
+        self.requests += 1
+        self.errors += 1
+        self.error_rate += self.alpha * (1.0 - self.error_rate)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_failures:
+            # Stop routing to a provider that keeps failing until the cooldown passes
+            self.cooldown_until = time.monotonic() + cooldown
+
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "healthy": self.healthy(),
+            "requests": self.requests,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "error_rate": round(self.error_rate, 3),
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "hedges_fired": self.hedges_fired,
+            "hedge_wins": self.hedge_wins
+        }
+
+
+class ProviderRouter:
+    """
+    Latency-aware routing across every configured LLM provider.
+
+    Each request goes to the healthy provider with the lowest EWMA latency
+    (penalized by its recent error rate); a provider that fails several times
+    in a row is benched for a cooldown period. If the chosen provider has not
+    answered within its own p95 latency, a hedged request is sent to the next
+    best provider and whichever finishes first wins; the other is cancelled.
+    Failures move on to the next provider immediately, and only when every
+    provider has failed does the caller see an exception.
+
+    With a scheduler, every call first waits for a slot under that provider's
+    concurrency and rate limits; the expected queueing delay counts towards
+    the ranking, so a backlog on one provider shifts traffic to the others.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, Callable[[Prompt], Awaitable[Any]]],
+        hedge_enabled: bool = True,
+        min_hedge_delay: float = 0.5,
+        default_hedge_delay: float = 3.0,
+        min_samples: int = 10,
+        prior_latency: float = 2.0,
+        max_failures: int = 3,
+        cooldown: float = 30.0,
+        scheduler: Optional[AIScheduler] = None
+    ):
+        self.providers = providers
+        self.order = list(providers)
+        self.stats_by_provider = {name: ProviderStats(name) for name in providers}
+        self.hedge_enabled = hedge_enabled
+        self.min_hedge_delay = min_hedge_delay
+        self.default_hedge_delay = default_hedge_delay
+        self.min_samples = min_samples
+        self.prior_latency = prior_latency
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.scheduler = scheduler
+
+    def ranked(self) -> List[str]:
+        """Providers from best to worst; unhealthy ones are kept last as a final resort."""
+        def score(name: str):
+            stats = self.stats_by_provider[name]
+            latency = stats.ewma_latency if stats.ewma_latency is not None else self.prior_latency
+            queueing = self.scheduler.expected_wait(name, latency) if self.scheduler else 0.0
+            return (
+                not stats.healthy(),
+                latency * (1.0 + 4.0 * stats.error_rate) + queueing,
+                self.order.index(name)
+            )
+        return sorted(self.order, key=score)
+
+    def hedge_delay(self, name: str) -> float:
+        """How long to wait on `name` before hedging: its p95 latency once enough samples exist."""
+        stats = self.stats_by_provider[name]
+        if len(stats.samples) < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, stats.percentile(0.95))
+
+    def record(self, name: str, latency: Optional[float]):
+        """Record the outcome of a call made outside `call` (latency None means it failed)."""
+        stats = self.stats_by_provider[name]
+        if latency is None:
+            stats.record_failure(self.max_failures, self.cooldown)
+        else:
+            stats.record_success(latency)
+
+    def slot(self, name: str, priority: int = INTERACTIVE):
+        """Scheduler slot for a call made outside `call`, such as a stream (no-op without a scheduler)."""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(name, priority)
+
+    async def _timed(
+        self,
+        name: str,
+        prompt: Prompt,
+        priority: int,
+        kwargs: Dict[str, Any],
+        on_start: Optional[asyncio.Future] = None
+    ) -> Any:
+        # Latency is measured from when the provider call starts, not from when it was queued;
+        # `on_start` receives that time so the caller can start its hedge timer there too
+        started = None
+
+        async def invoke():
+            nonlocal started
+            started = time.perf_counter()
+            if on_start is not None and not on_start.done():
+                on_start.set_result(started)
+            return await self.providers[name](prompt, **kwargs)
+
+        try:
+            if self.scheduler is not None:
+                result = await self.scheduler.run(name, priority, invoke)
+            else:
+                result = await invoke()
+        except asyncio.CancelledError:
+            stats = self.stats_by_provider[name]
+            stats.cancelled += 1
+            if started is not None:
+                # A cancelled loser took at least this long; keep it in the window so p95 is not biased low
+                stats.samples.append(time.perf_counter() - started)
+            raise
+        except ProviderBusy:
+            # A full queue says nothing about the provider's health
+            raise
+        except Exception:
+            self.record(name, None)
+            raise
+        self.record(name, time.perf_counter() - started)
+        return result
+
+    async def call(self, prompt: Prompt, priority: int = INTERACTIVE, **kwargs) -> Tuple[Any, str]:
+        """
+        Run `prompt` on the best provider, hedging and failing over as needed.
+        `priority` is the scheduler class (interactive or background); extra
+        keyword arguments are passed through to the provider call.
+
+        Returns:
+            (result, provider name that produced it)
+        """
+        candidates = self.ranked()
+        if not candidates:
+            raise RuntimeError("No AI providers configured")
+
+        loop = asyncio.get_running_loop()
+        running: Dict[asyncio.Task, str] = {}
+        # Resolves with the call's start time once the task holds its scheduler slot
+        starts: Dict[asyncio.Task, asyncio.Future] = {}
+        errors = []
+
+        def launch():
+            name = candidates.pop(0)
+            on_start = loop.create_future()
+            task = asyncio.ensure_future(self._timed(name, prompt, priority, kwargs, on_start))
+            running[task] = name
+            starts[task] = on_start
+            return name
+
+        primary = launch()
+        try:
+            while running:
+                timeout = None
+                waiting_on = set(running)
+                if self.hedge_enabled and candidates and len(running) == 1:
+                    task, name = next(iter(running.items()))
+                    if starts[task].done():
+                        timeout = max(0.0, self.hedge_delay(name) - (time.perf_counter() - starts[task].result()))
+                    else:
+                        # Still queued for a scheduler slot; queue wait must not count towards the hedge delay
+                        waiting_on.add(starts[task])
+                done, _ = await asyncio.wait(waiting_on, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # The in-flight request is slower than its p95: hedge on the next provider
+                    self.stats_by_provider[primary].hedges_fired += 1
+                    launch()
+                    continue
+
+                done = [task for task in done if task in running]
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is None:
+                        if name != primary:
+                            self.stats_by_provider[name].hedge_wins += 1
+                        return task.result(), name
+                    errors.append(f"{name}: {task.exception()}")
+                    print(f"⚠️ AI provider {name.upper()} failed: {task.exception()}")
+
+                if not running and candidates:
+                    primary = launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise RuntimeError("All AI providers failed (" + "; ".join(errors) + ")")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider routing metrics, best provider first."""
+        return {
+            "ranking": self.ranked(),
+            "hedging": self.hedge_enabled,
+            "providers": {
+                name: {
+                    **self.stats_by_provider[name].to_dict(),
+                    "hedge_delay_ms": round(self.hedge_delay(name) * 1000, 1)
+                }
+                for name in self.order
+            }
+        }
+
+
+def router_from_env(providers: Dict[str, Callable[[Prompt], Awaitable[Any]]]) -> ProviderRouter:
+    """Build a router configured via the AI_HEDGE_* / AI_PROVIDER_* environment variables."""
+    scheduler = scheduler_from_env(list(providers)) if os.getenv("AI_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes") else None
+    return ProviderRouter(
+        providers,
+        hedge_enabled=os.getenv("AI_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        min_hedge_delay=float(os.getenv("AI_HEDGE_MIN_DELAY_MS", "500")) / 1000,
+        default_hedge_delay=float(os.getenv("AI_HEDGE_DEFAULT_DELAY_MS", "3000")) / 1000,
+        max_failures=int(os.getenv("AI_PROVIDER_MAX_FAILURES", "3")),
+        cooldown=float(os.getenv("AI_PROVIDER_COOLDOWN", "30")),
+        scheduler=scheduler
+    )
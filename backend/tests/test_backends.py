@@ -0,0 +1,108 @@
+"""
+Output contract of the local inference backends.
+
+Every backend build_pipeline supports must return the same shapes the
+summarizer and sentiment analyzer rely on: one {"summary_text": str} per
+input for summarization and one {"label", "score"} per input for sentiment,
+with labels the analyzer maps onto POSITIVE / NEGATIVE / NEUTRAL. Runs on
+tiny random models (no download); backends whose runtime is not installed
+are skipped.
+
+    python -m pytest backend/tests -q
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR / "benchmarks"))
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from ml_models.backends import SUPPORTED_BACKENDS, build_pipeline  # noqa: E402
+from ml_models.result_cache import ResultCache  # noqa: E402
+from ml_models.sentiment import SentimentAnalyzer  # noqa: E402
+from ml_models.summarizer import NewsSummarizer  # noqa: E402
+from inference_backends import build_tiny_models  # noqa: E402
+
+TEXTS = [
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation. "
+    "Officials signalled that further increases were possible. Markets had largely expected the move.",
+    "A powerful storm swept across the coast overnight, leaving thousands of homes without electricity.",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_models(tmp_path_factory):
+    return build_tiny_models(tmp_path_factory.mktemp("tiny_models"))
+
+
+def build_or_skip(task: str, model: str, backend: str):
+    try:
+        return build_pipeline(task, model, backend)
+    except (ImportError, ModuleNotFoundError) as e:
+        pytest.skip(f"{backend} backend unavailable: {e}")
+    except Exception as e:
+        # e.g. optimum installed against an incompatible onnx/protobuf runtime
+        if backend == "pytorch":
+            raise
+        pytest.skip(f"{backend} backend could not be built: {e}")
+
+
+@pytest.fixture(autouse=True)
+def onnx_export_dir(tmp_path, monkeypatch):
+    # Keep ONNX exports out of the source tree
+    monkeypatch.setattr("ml_models.backends.ONNX_MODEL_DIR", tmp_path / "onnx")
+
+
+@pytest.fixture(autouse=True)
+def memory_result_cache(monkeypatch):
+    # A fresh memory-only cache per test: tiny-model outputs never reach the
+    # persistent cache, and each backend's pipeline really runs
+    cache = ResultCache(db_path=None)
+    for module in ("ml_models.result_cache", "ml_models.summarizer", "ml_models.sentiment"):
+        monkeypatch.setattr(f"{module}.result_cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize("backend", SUPPORTED_BACKENDS)
+def test_summarization_contract(backend, tiny_models, memory_result_cache):
+    pipe = build_or_skip("summarization", tiny_models["summarization"], backend)
+    outputs = pipe(TEXTS, max_length=20, min_length=2, truncation=True, batch_size=len(TEXTS))
+
+    assert isinstance(outputs, list) and len(outputs) == len(TEXTS)
+    for output in outputs:
+        assert set(output) == {"summary_text"}
+        assert isinstance(output["summary_text"], str)
+
+    summarizer = NewsSummarizer()
+    summarizer.summarizer, summarizer.tried_loading = pipe, True
+    summarizer.cache_model, summarizer.cache_backend = tiny_models["summarization"], backend
+    summaries = summarizer.summarize_batch(TEXTS, max_length=20, min_length=2)
+    assert len(summaries) == len(TEXTS) and all(isinstance(summary, str) for summary in summaries)
+    assert memory_result_cache.misses == len(TEXTS)  # generated by this backend, not served from a cache
+
+
+@pytest.mark.parametrize("backend", SUPPORTED_BACKENDS)
+def test_sentiment_contract(backend, tiny_models, memory_result_cache):
+    pipe = build_or_skip("sentiment-analysis", tiny_models["sentiment-analysis"], backend)
+    outputs = pipe(TEXTS, truncation=True, batch_size=len(TEXTS))
+
+    assert isinstance(outputs, list) and len(outputs) == len(TEXTS)
+    for output in outputs:
+        assert set(output) == {"label", "score"}
+        assert output["label"].lower() in {"negative", "neutral", "positive"}
+        assert 0.0 <= output["score"] <= 1.0
+
+    analyzer = SentimentAnalyzer()
+    analyzer.sentiment_pipeline, analyzer.tried_loading = pipe, True
+    analyzer.cache_model, analyzer.cache_backend = tiny_models["sentiment-analysis"], backend
+    for result in analyzer.analyze_batch(TEXTS):
+        assert set(result) == {"label", "score", "confidence"}
+        assert result["label"] in {"POSITIVE", "NEGATIVE", "NEUTRAL"}
+        assert result["confidence"] in {"high", "medium", "low"}
+    assert memory_result_cache.misses == len(TEXTS)
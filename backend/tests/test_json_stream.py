@@ -0,0 +1,74 @@
+"""
+JSONSectionParser: top-level members of a streamed JSON object are decoded
+as soon as they close, however the text is split into chunks.
+
+    python -m pytest backend/tests -q
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.json_stream import JSONSectionParser  # noqa: E402
+
+ANALYSIS = {
+    "summary": {"text": "Rates rise {again}, \"analysts\" say", "points": ["a, b", "[c]"]},
+    "sentiment": {"label": "NEUTRAL", "score": 0.5},
+    "political_analysis": {"lean": "center", "note": "ends with a backslash \\"},
+    "key_insights": ["}", "{", "\",\"", "\\\\"],
+    "metadata": {"nested": {"deep": [1, {"x": "}]"}]}, "empty": {}}
+}
+TEXT = json.dumps(ANALYSIS, indent=2)
+
+
+def feed_in_chunks(text: str, size: int):
+    parser = JSONSectionParser()
+    sections = []
+    for i in range(0, len(text), size):
+        sections.extend(parser.feed(text[i:i + size]))
+    return parser, sections
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(TEXT)])
+def test_sections_split_across_chunks(size):
+    parser, sections = feed_in_chunks(TEXT, size)
+    assert parser.done
+    assert sections == list(ANALYSIS.items())
+
+
+def test_each_section_is_emitted_once_its_member_closes():
+    parser = JSONSectionParser()
+    summary_end = TEXT.index('"sentiment"')
+    assert parser.feed(TEXT[:summary_end]) == [("summary", ANALYSIS["summary"])]
+    assert parser.feed(TEXT[summary_end:]) == [(key, ANALYSIS[key]) for key in list(ANALYSIS)[1:]]
+
+
+def test_braces_and_quotes_inside_strings_do_not_close_members():
+    text = '{"a": "} ] , { [", "b": "say \\"}\\" twice", "c": "\\\\", "d": 1}'
+    parser, sections = feed_in_chunks(text, 1)
+    assert parser.done
+    assert sections == list(json.loads(text).items())
+
+
+def test_preamble_and_trailing_text_are_ignored():
+    parser, sections = feed_in_chunks("```json\n" + TEXT + "\n```", 5)
+    assert sections == list(ANALYSIS.items())
+    assert parser.feed('{"late": 1}') == []
+
+
+def test_truncated_stream_returns_completed_sections_only():
+    cut = TEXT.index('"key_insights"') + 20
+    parser, sections = feed_in_chunks(TEXT[:cut], 4)
+    assert not parser.done
+    assert [key for key, _ in sections] == ["summary", "sentiment", "political_analysis"]
+    assert parser.buffer == TEXT[:cut]
+
+
+def test_malformed_member_is_skipped():
+    parser, sections = feed_in_chunks('{"a": 1, "b": tru, "c": [2]}', 3)
+    assert parser.done
+    assert sections == [("a", 1), ("c", [2])]
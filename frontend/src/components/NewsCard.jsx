@@ -16,7 +16,8 @@ import {
   Leaf
 } from 'lucide-react';
 import { 
-  fetchArticleIntelligence
+  fetchArticleIntelligence,
+  streamArticleIntelligence
 } from '../services/api';
 
 const NewsCard = ({ article, onAddToFavorites, onRemoveFromFavorites, isFavorite, showAI = true }) => {
@@ -32,17 +33,34 @@ const NewsCard = ({ article, onAddToFavorites, onRemoveFromFavorites, isFavorite
   const handleFetchIntelligence = async () => {
     if (intelligence) return; // already loaded
     setLoading(prev => ({ ...prev, intelligence: true }));
+    const content = article.content || article.description || '';
+    let streamed = false;
     try {
-      const response = await fetchArticleIntelligence(
+      // Each tab fills in as soon as its section is generated; the skeleton only shows until the first one
+      await streamArticleIntelligence(
         article.title,
         article.description || '',
-        article.content || article.description || ''
+        content,
+        (section, data) => {
+          streamed = true;
+          setIntelligence(prev => ({ ...(prev || {}), [section]: data }));
+          setLoading(prev => ({ ...prev, intelligence: false }));
+        },
+        article.url
       );
-      if (response.status === 'success') {
-        setIntelligence(response.intelligence);
-      }
     } catch (error) {
-      console.error('Error fetching article intelligence:', error);
+      console.error('Error streaming article intelligence:', error);
+      if (!streamed) {
+        // Stream request failed before any section arrived: fall back to the single JSON response
+        try {
+          const response = await fetchArticleIntelligence(article.title, article.description || '', content, article.url);
+          if (response.status === 'success') {
+            setIntelligence(response.intelligence);
+          }
+        } catch (fallbackError) {
+          console.error('Error fetching article intelligence:', fallbackError);
+        }
+      }
     } finally {
       setLoading(prev => ({ ...prev, intelligence: false }));
     }
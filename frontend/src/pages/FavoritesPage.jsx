@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Heart, Trash2, ExternalLink, Search, Filter, AlertCircle, RefreshCw } from 'lucide-react';
 import NewsCard from '../components/NewsCard';
-import { fetchRecommendations, getFavorites } from '../services/api';
+import { fetchRecommendations, getFavoritesPage } from '../services/api';
 
 const FavoritesPage = () => {
   const [favorites, setFavorites] = useState([]);
@@ -12,6 +12,8 @@ const FavoritesPage = () => {
   const [showRecommendations, setShowRecommendations] = useState(false);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // Load favorites from localStorage on component mount
   useEffect(() => {
@@ -60,9 +62,10 @@ const FavoritesPage = () => {
       
       // Try to fetch from backend and merge (backend is optional)
       try {
-        const backendFavorites = await getFavorites();
-        console.log('Fetched favorites from backend:', backendFavorites);
-        const backendArray = Array.isArray(backendFavorites) ? backendFavorites : [];
+        const page = await getFavoritesPage();
+        console.log('Fetched favorites from backend:', page.favorites);
+        const backendArray = page.favorites;
+        setNextCursor(page.nextCursor);
         
         // Merge localStorage and backend favorites, prioritizing localStorage
         // Combine unique articles by URL
@@ -95,6 +98,25 @@ const FavoritesPage = () => {
     }
   };
 
+  // Append the next backend page, skipping articles already shown
+  const loadMoreFavorites = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await getFavoritesPage(nextCursor);
+      setFavorites(prev => {
+        const current = Array.isArray(prev) ? prev : [];
+        const urls = new Set(current.map(fav => fav.url));
+        return [...current, ...page.favorites.filter(fav => !urls.has(fav.url))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more favorites:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const filterFavorites = () => {
     // Ensure favorites is always an array
     if (!Array.isArray(favorites)) {
@@ -353,6 +375,20 @@ const FavoritesPage = () => {
             )}
           </div>
         )}
+
+        {/* Next backend page */}
+        {!loading && nextCursor && (
+          <div className="mt-8 flex justify-center">
+            <button
+              onClick={loadMoreFavorites}
+              disabled={loadingMore}
+              className="inline-flex items-center px-6 py-3 bg-red-600 text-white rounded-lg hover:bg-red-700 disabled:opacity-50 transition-colors duration-200"
+            >
+              {loadingMore && <RefreshCw className="h-5 w-5 mr-2 animate-spin" />}
+              Load More Favorites
+            </button>
+          </div>
+        )}
       </main>
     </div>
   );
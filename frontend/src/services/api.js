@@ -11,9 +11,21 @@ const api = axios.create({
   timeout: 30000, // 30 seconds timeout for ML operations
 });
 
+// Favorites are stored per user; without accounts, each browser gets its own id
+const USER_ID_KEY = 'newshub_user_id';
+const getUserId = () => {
+  let userId = localStorage.getItem(USER_ID_KEY);
+  if (!userId) {
+    userId = window.crypto?.randomUUID?.() || `user-${Date.now()}-${Math.random().toString(36).slice(2, 10)}`;
+    localStorage.setItem(USER_ID_KEY, userId);
+  }
+  return userId;
+};
+
 // Request interceptor for logging
 api.interceptors.request.use(
   (config) => {
+    config.headers['X-User-Id'] = getUserId();
     console.log(`Making ${config.method?.toUpperCase()} request to ${config.url}`);
     console.log('Full URL:', `${config.baseURL}${config.url}`);
     console.log('Request params:', config.params);
@@ -113,12 +125,14 @@ export const fetchRecommendations = async (articleUrl) => {
 };
 
 // AI/ML API endpoints
-export const summarizeArticle = async (text, maxLength = 150, minLength = 30) => {
+// mode: 'fast' (instant extractive, for list views), 'abstractive' (BART, for detail views) or 'auto'
+export const summarizeArticle = async (text, maxLength = 150, minLength = 30, mode = 'abstractive') => {
   try {
     return await api.post('/news/summarize', {
       text,
       max_length: maxLength,
-      min_length: minLength
+      min_length: minLength,
+      mode
     });
   } catch (error) {
     console.error('Error summarizing article:', error);
@@ -150,10 +164,27 @@ export const getRecommendations = async (article, nRecommendations = 3) => {
 };
 
 // User favorites API endpoints
+// Favorites are paginated newest first; pass the previous page's next_cursor as `before`
+export const getFavoritesPage = async (before = null, limit = 50) => {
+  try {
+    const response = await api.get('/user/favorites', {
+      params: before ? { limit, before } : { limit }
+    });
+    return {
+      favorites: Array.isArray(response?.favorites) ? response.favorites : [],
+      nextCursor: response?.next_cursor || null,
+      total: response?.total ?? 0
+    };
+  } catch (error) {
+    console.error('Error fetching favorites page:', error);
+    throw error;
+  }
+};
+
 export const getFavorites = async () => {
   try {
     const response = await api.get('/user/favorites');
-    // Backend returns { status, favorites, count } - extract the favorites array
+    // Backend returns { status, favorites, count, total, next_cursor } - extract the first page of favorites
     if (response && Array.isArray(response.favorites)) {
       return response.favorites;
     } else if (Array.isArray(response)) {
@@ -190,12 +221,14 @@ export const removeFromFavorites = async (url) => {
   }
 };
 
-export const fetchArticleIntelligence = async (title, description, content) => {
+// Passing the article URL lets the backend reuse a stored analysis instead of calling the LLM again
+export const fetchArticleIntelligence = async (title, description, content, url = null) => {
   try {
     return await api.post('/news/intelligence', {
       title,
       description,
-      content
+      content,
+      url
     });
   } catch (error) {
     console.error('Error fetching article intelligence:', error);
@@ -203,6 +236,46 @@ export const fetchArticleIntelligence = async (title, description, content) => {
   }
 };
 
+// Streams intelligence sections over SSE; onSection(name, data) fires as each one is generated.
+// Resolves with the final `done` payload.
+export const streamArticleIntelligence = async (title, description, content, onSection, url = null) => {
+  const response = await fetch(`${API_BASE_URL}/news/intelligence/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify({ title, description, content, url })
+  });
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.detail || 'Server error occurred');
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let done = null;
+  while (true) {
+    const { value, done: finished } = await reader.read();
+    if (finished) break;
+    buffer += decoder.decode(value, { stream: true });
+    const messages = buffer.split('\n\n');
+    buffer = messages.pop();
+    for (const message of messages) {
+      const event = message.match(/^event: (.*)$/m)?.[1];
+      const data = message.match(/^data: (.*)$/m)?.[1];
+      if (!event || data === undefined) continue;
+      const payload = JSON.parse(data);
+      if (event === 'section') {
+        onSection(payload.section, payload.data);
+      } else if (event === 'done') {
+        done = payload;
+      } else if (event === 'error') {
+        throw new Error(payload.detail);
+      }
+    }
+  }
+  return done;
+};
+
 // Health check endpoint
 export const healthCheck = async () => {
   try {